@@ -4,10 +4,15 @@ Defines the interface for all AI providers in Carlos
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from collections import deque
+from typing import Dict, Any, List, Optional, Iterator, Deque, Sequence
 from utils.logger import CarlosLogger
 
 
+# Roles accepted in conversation history; prompt builders rely on this set
+HISTORY_ROLES = frozenset({"user", "assistant"})
+
+
 class BaseAIProvider(ABC):
     """Abstract base class for AI providers."""
     
@@ -21,7 +26,8 @@ class BaseAIProvider(ABC):
         """
         self.config = config
         self.logger = logger
-        self.conversation_history: List[Dict[str, str]] = []
+        # Keep the last 20 exchanges (user + assistant entry each); oldest are evicted
+        self.conversation_history: Deque[Dict[str, str]] = deque(maxlen=40)
         self.model_name: Optional[str] = None
         self.is_connected = False
     
@@ -49,6 +55,21 @@ class BaseAIProvider(ABC):
         """
         pass
     
+    def stream_message(self, message: str, context: Optional[List[Dict[str, str]]] = None) -> Iterator[str]:
+        """
+        Send a message to the AI provider and yield the response incrementally.
+        
+        Providers without native streaming yield the full response at once.
+        
+        Args:
+            message: User message
+            context: Optional conversation context
+            
+        Yields:
+            AI response text chunks
+        """
+        yield self.send_message(message, context)
+    
     @abstractmethod
     def get_available_models(self) -> List[str]:
         """
@@ -77,14 +98,26 @@ class BaseAIProvider(ABC):
         self.conversation_history.clear()
         self.logger.info("Conversation history cleared")
     
-    def get_conversation_history(self) -> List[Dict[str, str]]:
+    def get_conversation_history(self) -> Sequence[Dict[str, str]]:
         """
         Get conversation history.
         
+        The live history is returned without copying; callers must treat it
+        as read-only. Use get_conversation_history_copy() to get a snapshot.
+        
+        Returns:
+            Sequence of conversation entries
+        """
+        return self.conversation_history
+    
+    def get_conversation_history_copy(self) -> List[Dict[str, str]]:
+        """
+        Get a copy of the conversation history.
+        
         Returns:
             List of conversation entries
         """
-        return self.conversation_history.copy()
+        return list(self.conversation_history)
     
     def add_to_history(self, role: str, content: str) -> None:
         """
@@ -93,7 +126,13 @@ class BaseAIProvider(ABC):
         Args:
             role: 'user' or 'assistant'
             content: Message content
+            
+        Raises:
+            ValueError: If role is not 'user' or 'assistant'
         """
+        if role not in HISTORY_ROLES:
+            raise ValueError(f"Invalid conversation role: {role}")
+        
         self.conversation_history.append({
             "role": role,
             "content": content
@@ -3,14 +3,55 @@ Ollama AI Provider Implementation
 Provides Ollama integration for Carlos AI Assistant
 """
 
-import json
+import logging
+import hashlib
+import orjson
 import requests
 import time
-import subprocess
-import psutil
-from typing import List, Dict, Optional, Any
+import threading
+from collections import OrderedDict
+from typing import List, Dict, FrozenSet, Optional, Any, Iterator, Sequence, Tuple
 from utils.logger import CarlosLogger
 from .base_provider import BaseAIProvider
+from .semantic_cache import SemanticCache
+from utils.persistent_cache import PersistentCache
+from utils.http import CONNECT_TIMEOUT, create_session
+
+
+# Payloads are pre-serialized with orjson, so the content type is set explicitly
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Read size for streamed responses
+STREAM_CHUNK_SIZE = 4096
+
+
+def _iter_ndjson(response: requests.Response) -> Iterator[Dict[str, Any]]:
+    """
+    Parse a streamed NDJSON response body.
+    
+    Splits raw bytes on newlines directly instead of going through
+    ``iter_lines``, carrying any partial line over to the next read.
+    
+    Args:
+        response: Response opened with ``stream=True``
+        
+    Yields:
+        Parsed JSON objects, one per line
+    """
+    buf = b""
+    for data in response.iter_content(chunk_size=STREAM_CHUNK_SIZE, decode_unicode=False):
+        buf += data
+        start = 0
+        while (end := buf.find(b"\n", start)) != -1:
+            line = buf[start:end]
+            start = end + 1
+            if line.strip():
+                yield orjson.loads(line)
+        buf = buf[start:]
+    
+    # Final line without a trailing newline
+    if buf.strip():
+        yield orjson.loads(buf)
 
 
 class OllamaProvider(BaseAIProvider):
@@ -40,10 +81,63 @@ class OllamaProvider(BaseAIProvider):
         self.cleanup_on_exit = ollama_config.get('cleanup_on_exit', True)
         self.unload_timeout = ollama_config.get('unload_timeout', 10)
         self.verify_unload = ollama_config.get('verify_unload', True)
+        self.use_chat_api = ollama_config.get('use_chat_api', True)
+        self.summarize_history = ollama_config.get('summarize_history', True)
+        self.keep_alive = ollama_config.get('keep_alive', '30m')
+        self.preload_model = ollama_config.get('preload_model', True)
+        
+        # Generation options shared by every request
+        self._refresh_request_options()
+        
+        # (connect, read) timeouts: fail fast on connect, full budget for inference
+        self._timeouts = (CONNECT_TIMEOUT, self.timeout)
+        self._unload_timeouts = (CONNECT_TIMEOUT, self.unload_timeout)
+        
+        # Cache of available models from /api/tags
+        self._models_cache: Optional[List[str]] = None
+        self._model_names: FrozenSet[str] = frozenset()
+        self._models_cache_ts: float = 0.0
+        self._models_cache_ttl = ollama_config.get('models_cache_ttl', 60)
+        
+        # Exact-match response cache, only used when temperature is 0 so that
+        # replies are deterministic; keyed by a hash of the full request payload
+        self._response_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._response_cache_size = ollama_config.get('response_cache_size', 256)
+        self.cache_stats = {"hits": 0, "misses": 0}
+        
+        # On-disk copy of the response cache so replies survive restarts
+        self._persistent_cache: Optional[PersistentCache] = None
+        response_cache_file = ollama_config.get('response_cache_file')
+        if response_cache_file and self.temperature == 0:
+            self._persistent_cache = PersistentCache(
+                response_cache_file, logger,
+                max_entries=ollama_config.get('response_cache_file_size', 10000)
+            )
+        
+        # Optional semantic cache: reuses replies for paraphrased prompts using
+        # embeddings from Ollama's /api/embed. Also limited to temperature 0.
+        semantic_config = ollama_config.get('semantic_cache', {})
+        self.embed_model = semantic_config.get('embed_model', 'nomic-embed-text')
+        self._semantic_cache: Optional[SemanticCache] = None
+        if semantic_config.get('enabled', False):
+            self._semantic_cache = SemanticCache(
+                self._embed,
+                threshold=semantic_config.get('threshold', 0.92),
+                max_entries=semantic_config.get('max_entries', 512)
+            )
         
         # Track if we started Ollama
         self.ollama_started_by_us = False
         
+        # Persistent HTTP session so keep-alive connections are reused across
+        # calls, with room for concurrent requests (e.g. /api/tags while a
+        # generation streams)
+        self.session = create_session(pool_maxsize=10, retries=3, backoff_factor=0.5, headers={
+            "Connection": "keep-alive",
+            "Accept-Encoding": "gzip, deflate",
+            "User-Agent": "Carlos/1.0"
+        })
+        
         # System prompt for assistant personality
         self.system_prompt = (
             "You are Carlos, a helpful and friendly AI assistant. "
@@ -51,38 +145,109 @@ class OllamaProvider(BaseAIProvider):
             "You are knowledgeable but humble, and always try to be helpful."
         )
         
+        # Precomputed prompt pieces reused on every turn
+        self._system_prefix = f"{self.system_prompt}\n\n"
+        self._role_prefix = {"user": "User: ", "assistant": "Carlos: "}
+        self._system_message = {"role": "system", "content": self.system_prompt}
+        
+        # Running summary of turns evicted from the history window
+        self._summary: Optional[str] = None
+        self._summary_prefix = ""
+        self._summary_messages: List[Dict[str, str]] = []
+        
+        # Summaries are generated in the background after a reply and applied
+        # before the next request: (number of oldest entries summarized, text)
+        self._summary_thread: Optional[threading.Thread] = None
+        self._pending_summary: Optional[Tuple[int, str]] = None
+        
+        # System prompt, summary and history rendered for /api/generate.
+        # Extended in place as turns are added so the prompt prefix stays
+        # byte-identical between turns; None means it must be rebuilt.
+        self._prompt_prefix: Optional[str] = None
+        
         self.logger.info(f"Ollama Provider initialized with model: {self.model_name}")
     
-    def test_connection(self) -> bool:
+    def test_connection(self, tags: Optional[Dict[str, Any]] = None) -> bool:
         """
         Test connection to Ollama.
         
+        Also refreshes the model list cache, so a following
+        ``get_available_models`` call needs no extra round-trip.
+        
+        Args:
+            tags: Already fetched ``/api/tags`` response to reuse instead of
+                querying Ollama again
+        
         Returns:
             True if connection successful, False otherwise
         """
+        self.logger.info("Testing connection to Ollama...")
+        
+        if tags is not None:
+            self._apply_tags(tags)
+        elif self._fetch_tags() is None:
+            return False
+        
+        if self.model_name not in self._model_names:
+            self.logger.warning(f"Model {self.model_name} is not listed by Ollama")
+        elif self.preload_model:
+            # Load the model in the background so the first message doesn't wait for it
+            threading.Thread(target=self._preload_model, name="OllamaPreload", daemon=True).start()
+        elif tags is not None:
+            # Nothing has gone through our session yet; open a pooled connection
+            # now so the first message doesn't pay for connection setup
+            self._warm_connection()
+        
+        self.logger.info("Successfully connected to Ollama")
+        return True
+    
+    def _warm_connection(self) -> None:
+        """Open a keep-alive connection in the session pool with a cheap request."""
         try:
-            self.logger.info("Testing connection to Ollama...")
-            
-            # Test basic connectivity
-            response = requests.get(f"{self.base_url}/api/tags", timeout=self.timeout)
+            self.session.head(f"{self.base_url}/", timeout=self._timeouts)
+        except requests.exceptions.RequestException as e:
+            self.logger.debug("Connection warm-up failed: %s", e)
+    
+    def _fetch_tags(self) -> Optional[Dict[str, Any]]:
+        """
+        Fetch ``/api/tags`` and update connection state and the model cache.
+        
+        Returns:
+            Parsed response or None if the request failed
+        """
+        try:
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=self._timeouts)
             
-            if response.status_code == 200:
-                self.is_connected = True
-                self.logger.info("Successfully connected to Ollama")
-                return True
-            else:
+            if response.status_code != 200:
                 self.logger.error(f"Ollama returned status code: {response.status_code}")
-                return False
+                self.is_connected = False
+                return None
+            
+            tags = orjson.loads(response.content)
+            self._apply_tags(tags)
+            return tags
                 
         except requests.exceptions.ConnectionError:
             self.logger.error("Failed to connect to Ollama - service not running")
-            return False
         except requests.exceptions.Timeout:
             self.logger.error("Connection to Ollama timed out")
-            return False
         except Exception as e:
-            self.logger.error(f"Unexpected error testing Ollama connection: {e}")
-            return False
+            self.logger.error(f"Unexpected error querying Ollama: {e}")
+        
+        self.is_connected = False
+        return None
+    
+    def _apply_tags(self, tags: Dict[str, Any]) -> None:
+        """
+        Mark the provider connected and fill the model cache from ``/api/tags``.
+        
+        Args:
+            tags: Parsed ``/api/tags`` response
+        """
+        self.is_connected = True
+        self._models_cache = [model['name'] for model in tags.get('models', ())]
+        self._model_names = frozenset(self._models_cache)
+        self._models_cache_ts = time.monotonic()
     
     def send_message(self, message: str, context: Optional[List[Dict[str, str]]] = None) -> str:
         """
@@ -96,22 +261,9 @@ class OllamaProvider(BaseAIProvider):
             AI response text
         """
         try:
-            # Add user message to history
-            self.add_to_history("user", message)
-            
-            # Build conversation prompt
-            prompt = self._build_conversation_prompt(message, context)
-            
-            # Make request to Ollama
-            response_text = self._make_request(prompt)
+            response_text = "".join(self.stream_message(message, context))
             
             if response_text:
-                # Add assistant response to history
-                self.add_to_history("assistant", response_text)
-                
-                # Trim history if needed
-                self._trim_conversation_history()
-                
                 return response_text
             else:
                 error_msg = "Failed to get response from Ollama"
@@ -119,64 +271,265 @@ class OllamaProvider(BaseAIProvider):
                 return error_msg
                 
         except Exception as e:
-            error_msg = f"Error sending message to Ollama: {e}"
-            self.logger.error(error_msg, exc_info=True)
-            return error_msg
+            self.logger.error("Error sending message to Ollama: %s", e,
+                              exc_info=self.logger.is_enabled_for(logging.DEBUG))
+            return f"Error sending message to Ollama: {e}"
     
-    def get_available_models(self) -> List[str]:
+    def stream_message(self, message: str, context: Optional[List[Dict[str, str]]] = None) -> Iterator[str]:
         """
-        Get list of available Ollama models.
+        Send a message to Ollama and yield the response as it is generated.
+        
+        Args:
+            message: User message
+            context: Optional conversation context
+            
+        Yields:
+            Response text chunks
+        """
+        # Fold in a summary finished since the last reply
+        self._apply_pending_summary()
+        
+        options = self._base_options
+        
+        # Build request before recording the message so it is not sent twice
+        if self.use_chat_api:
+            endpoint = "/api/chat"
+            payload = {
+                "model": self.model_name,
+                "messages": self._build_chat_messages(message, context),
+                "stream": True,
+                "keep_alive": self.keep_alive,
+                "options": options
+            }
+        else:
+            endpoint = "/api/generate"
+            payload = {
+                "model": self.model_name,
+                "prompt": self._build_conversation_prompt(message, context),
+                "stream": True,
+                "keep_alive": self.keep_alive,
+                "options": options
+            }
+        
+        # Deterministic requests can be answered from the response cache
+        cache_key = self._response_cache_key(payload) if self.temperature == 0 else None
+        cached = self._get_cached_response(cache_key) if cache_key else None
+        
+        # Fall back to a paraphrase match under the same conversation state
+        embedding = None
+        context_key = None
+        if cache_key and cached is None and self._semantic_cache:
+            context_key = self._context_key(context)
+            embedding = self._semantic_cache.embed(message)
+            if embedding:
+                cached = self._semantic_cache.lookup(embedding, context_key)
         
+        # Add user message to history
+        self.add_to_history("user", message)
+        
+        if cached is not None:
+            self.cache_stats["hits"] += 1
+            response_text = cached
+            yield cached
+        else:
+            if cache_key:
+                self.cache_stats["misses"] += 1
+            
+            # Stream response from Ollama, keeping the full text for history
+            parts: List[str] = []
+            for chunk in self._stream_request(endpoint, payload):
+                parts.append(chunk)
+                yield chunk
+            
+            response_text = "".join(parts)
+            if response_text and cache_key:
+                self._cache_response(cache_key, response_text)
+                if embedding:
+                    self._semantic_cache.store(embedding, context_key, response_text)
+        
+        if response_text:
+            # Add assistant response to history
+            self.add_to_history("assistant", response_text)
+            
+            # Summarize old turns before the window starts dropping them; runs
+            # in the background so the reply finishes without waiting for it
+            self._trim_conversation_history()
+    
+    def _response_cache_key(self, payload: Dict[str, Any]) -> str:
+        """
+        Hash a request payload (model, options and full prompt) into a cache key.
+        
+        Args:
+            payload: Request payload
+            
         Returns:
-            List of model names
+            Hex digest identifying the payload
+        """
+        return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+    
+    def _get_cached_response(self, cache_key: str) -> Optional[str]:
+        """
+        Look up a response in memory, then in the persistent cache.
+        
+        Args:
+            cache_key: Key from ``_response_cache_key``
+            
+        Returns:
+            Cached response text or None
+        """
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            self._response_cache.move_to_end(cache_key)
+            return cached
+        
+        if self._persistent_cache:
+            cached = self._persistent_cache.get(cache_key)
+            if cached is not None:
+                self._remember_response(cache_key, cached)
+        return cached
+    
+    def _cache_response(self, cache_key: str, response_text: str) -> None:
+        """
+        Store a response in memory and in the persistent cache.
+        
+        Args:
+            cache_key: Key from ``_response_cache_key``
+            response_text: Complete response text
+        """
+        self._remember_response(cache_key, response_text)
+        if self._persistent_cache:
+            self._persistent_cache.set(cache_key, response_text)
+    
+    def _remember_response(self, cache_key: str, response_text: str) -> None:
+        """
+        Store a response, evicting the least recently used entry when full.
+        
+        Args:
+            cache_key: Key from ``_response_cache_key``
+            response_text: Complete response text
+        """
+        self._response_cache[cache_key] = response_text
+        if len(self._response_cache) > self._response_cache_size:
+            self._response_cache.popitem(last=False)
+    
+    def _context_key(self, context: Optional[List[Dict[str, str]]] = None) -> str:
+        """
+        Identify the conversation state a new prompt is asked in.
+        
+        Only the last assistant turn is used, so the key recurs whenever a
+        prompt follows the same reply (or starts a fresh conversation) rather
+        than being unique to every growing history.
+        
+        Args:
+            context: Optional conversation context
+            
+        Returns:
+            Hash of the model, options and last assistant reply (if any)
+        """
+        history = context if context is not None else self.conversation_history
+        last_reply = next(
+            (entry["content"] for entry in reversed(history) if entry.get("role") == "assistant"),
+            None
+        )
+        state = {
+            "model": self.model_name,
+            "options": self._base_options,
+            "api": self.use_chat_api,
+            "last_reply": last_reply
+        }
+        return hashlib.sha256(orjson.dumps(state)).hexdigest()
+    
+    def _embed(self, text: str) -> Optional[List[float]]:
+        """
+        Get an embedding for a text from Ollama.
+        
+        Args:
+            text: Text to embed
+            
+        Returns:
+            Embedding vector, or None on failure
         """
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=self.timeout)
+            response = self.session.post(
+                f"{self.base_url}/api/embed",
+                data=orjson.dumps({"model": self.embed_model, "input": text, "keep_alive": self.keep_alive}),
+                headers=JSON_HEADERS,
+                timeout=self._timeouts
+            )
+            if response.status_code != 200:
+                self.logger.warning("Embedding request failed: %s", response.status_code)
+                return None
+            
+            embeddings = orjson.loads(response.content).get("embeddings")
+            return embeddings[0] if embeddings else None
             
-            if response.status_code == 200:
-                models_data = response.json()
-                models = [model['name'] for model in models_data.get('models', [])]
-                self.logger.info(f"Found {len(models)} available models")
-                return models
-            else:
-                self.logger.error(f"Failed to get models: {response.status_code}")
-                return []
-                
         except Exception as e:
-            self.logger.error(f"Error getting available models: {e}")
+            self.logger.warning("Embedding request failed: %s", e)
+            return None
+    
+    def get_available_models(self, refresh: bool = False) -> List[str]:
+        """
+        Get list of available Ollama models.
+        
+        Results are cached for ``models_cache_ttl`` seconds.
+        
+        Args:
+            refresh: If True, bypass the cache and query Ollama
+            
+        Returns:
+            List of model names
+        """
+        if (not refresh and self._models_cache is not None
+                and time.monotonic() - self._models_cache_ts < self._models_cache_ttl):
+            return self._models_cache
+        
+        if self._fetch_tags() is None:
             return []
+        
+        self.logger.info(f"Found {len(self._models_cache)} available models")
+        return self._models_cache
     
-    def switch_model(self, model_name: str) -> bool:
+    def _refresh_request_options(self) -> None:
+        """Rebuild the generation options reused by every request payload."""
+        self._base_options = {"temperature": self.temperature, "num_predict": self.max_tokens}
+    
+    def switch_model(self, model_name: str, refresh: bool = False, verify: bool = False) -> bool:
         """
         Switch to a different Ollama model.
         
         Args:
             model_name: Name of the model to switch to
+            refresh: If True, re-query the model list instead of using the cache
+            verify: If True, load the new model to confirm Ollama can serve it
             
         Returns:
             True if successful, False otherwise
         """
         try:
             # Check if model is available
-            available_models = self.get_available_models()
+            available_models = self.get_available_models(refresh=refresh)
             
-            if model_name not in available_models:
+            if not available_models or model_name not in self._model_names:
                 self.logger.error(f"Model {model_name} not found in available models")
                 return False
             
             # Update model name
             old_model = self.model_name
             self.model_name = model_name
+            self._refresh_request_options()
             
-            # Test connection with new model
-            if self.test_connection():
-                self.logger.info(f"Successfully switched from {old_model} to {model_name}")
-                return True
-            else:
+            # The model list came from Ollama, so the server is reachable
+            self.is_connected = True
+            
+            # Optionally confirm the new model loads; no tokens are generated
+            if verify and not self._preload_model():
                 # Revert on failure
                 self.model_name = old_model
                 self.logger.error(f"Failed to switch to model {model_name}")
                 return False
+            
+            self.logger.info(f"Successfully switched from {old_model} to {model_name}")
+            return True
                 
         except Exception as e:
             self.logger.error(f"Error switching model: {e}")
@@ -199,38 +552,34 @@ class OllamaProvider(BaseAIProvider):
             }
             
             self.logger.info("Trying keep_alive=0s method...")
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/generate",
-                json=unload_payload,
-                timeout=self.unload_timeout
+                data=orjson.dumps(unload_payload),
+                headers=JSON_HEADERS,
+                timeout=self._unload_timeouts
             )
             
             if response.status_code == 200:
                 self.logger.info(f"Model {self.model_name} unloaded successfully via keep_alive")
                 return True
             
-            # Method 2: Try alternative unload endpoint
+            if response.status_code != 404:
+                self.logger.warning(f"Failed to unload model: {response.status_code}")
+                return False
+            
+            # Method 2: Fall back to alternative unload endpoint
             self.logger.info("Trying alternative unload method...")
-            response = requests.delete(
+            response = self.session.delete(
                 f"{self.base_url}/api/tags/{self.model_name}",
-                timeout=self.unload_timeout
+                timeout=self._unload_timeouts
             )
             
             if response.status_code == 200:
                 self.logger.info(f"Model {self.model_name} unloaded via delete endpoint")
                 return True
             
-            # Method 3: Try to unload via model management
-            self.logger.info("Trying model management unload...")
-            response = requests.post(
-                f"{self.base_url}/api/pull",
-                json={"name": self.model_name, "insecure": True},
-                timeout=self.unload_timeout
-            )
-            
-            # Even if this fails, we'll consider it a success if no error
-            self.logger.info("Model unload attempt completed")
-            return True
+            self.logger.warning(f"Failed to unload model: {response.status_code}")
+            return False
             
         except requests.exceptions.RequestException as e:
             self.logger.warning(f"Failed to unload model: {e}")
@@ -239,13 +588,38 @@ class OllamaProvider(BaseAIProvider):
             self.logger.error(f"Unexpected error unloading model: {e}")
             return False
     
-    def _make_request(self, message: str, test_mode: bool = False) -> Optional[str]:
+    def _preload_model(self) -> bool:
+        """
+        Load the model into memory without generating anything.
+        
+        Returns:
+            True if Ollama loaded the model, False otherwise
+        """
+        try:
+            response = self.session.post(
+                f"{self.base_url}/api/generate",
+                data=orjson.dumps({"model": self.model_name, "keep_alive": self.keep_alive}),
+                headers=JSON_HEADERS,
+                timeout=self._timeouts
+            )
+            
+            if response.status_code == 200:
+                self.logger.info(f"Model {self.model_name} preloaded (keep_alive: {self.keep_alive})")
+                return True
+            
+            self.logger.warning(f"Model preload returned status code: {response.status_code}")
+            return False
+            
+        except Exception as e:
+            self.logger.warning(f"Model preload failed: {e}")
+            return False
+    
+    def _make_request(self, message: str) -> Optional[str]:
         """
         Make a request to Ollama API.
         
         Args:
             message: Message to send
-            test_mode: If True, use minimal tokens for testing
             
         Returns:
             Response text or None if failed
@@ -255,28 +629,24 @@ class OllamaProvider(BaseAIProvider):
                 "model": self.model_name,
                 "prompt": message,
                 "stream": False,
-                "options": {
-                    "temperature": self.temperature,
-                    "num_predict": self.max_tokens if not test_mode else 10
-                }
+                "keep_alive": self.keep_alive,
+                "options": self._base_options
             }
             
             self.logger.debug(f"Sending request to Ollama: {payload}")
             
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/generate",
-                json=payload,
-                timeout=self.timeout
+                data=orjson.dumps(payload),
+                headers=JSON_HEADERS,
+                timeout=self._timeouts
             )
             
             if response.status_code == 200:
-                response_data = response.json()
+                response_data = orjson.loads(response.content)
                 response_text = response_data.get('response', '')
                 
-                if test_mode:
-                    self.logger.info("Test request successful")
-                else:
-                    self.logger.debug(f"Received response: {response_text[:100]}...")
+                self.logger.debug(f"Received response: {response_text[:100]}...")
                 
                 return response_text
             else:
@@ -290,6 +660,68 @@ class OllamaProvider(BaseAIProvider):
             self.logger.error(f"Unexpected error in request: {e}")
             return None
     
+    def _stream_request(self, endpoint: str, payload: Dict[str, Any]) -> Iterator[str]:
+        """
+        Make a streaming request to an Ollama generation endpoint.
+        
+        Handles both ``/api/generate`` and ``/api/chat`` response formats.
+        
+        Args:
+            endpoint: API path, e.g. "/api/chat"
+            payload: Request payload with "stream" enabled
+            
+        Yields:
+            Response text chunks as they are generated
+        """
+        try:
+            self.logger.debug(f"Sending streaming request to Ollama: {payload}")
+            
+            with self.session.post(
+                f"{self.base_url}{endpoint}",
+                data=orjson.dumps(payload),
+                headers=JSON_HEADERS,
+                timeout=self._timeouts,
+                stream=True
+            ) as response:
+                if response.status_code != 200:
+                    self.logger.error(f"Ollama API error: {response.status_code} - {response.text}")
+                    return
+                
+                # Read to EOF rather than stopping at the "done" chunk: leaving
+                # the chunked body unread makes urllib3 drop the connection
+                # instead of returning it to the keep-alive pool
+                for chunk in _iter_ndjson(response):
+                    if 'message' in chunk:
+                        text = chunk['message'].get('content', '')
+                    else:
+                        text = chunk.get('response', '')
+                    if text:
+                        yield text
+                        
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"Streaming request failed: {e}")
+        except Exception as e:
+            self.logger.error(f"Unexpected error in streaming request: {e}")
+    
+    def _build_chat_messages(self, current_message: str, context: Optional[List[Dict[str, str]]] = None) -> List[Dict[str, str]]:
+        """
+        Build the message list for the ``/api/chat`` endpoint.
+        
+        The system message and prior turns are passed through unchanged so
+        Ollama can reuse its KV cache for the shared prefix across turns.
+        
+        Args:
+            current_message: Current user message
+            context: Optional conversation context
+            
+        Returns:
+            List of role/content messages
+        """
+        history = context if context is not None else self.conversation_history
+        
+        return [self._system_message, *self._summary_messages, *history,
+                {"role": "user", "content": current_message}]
+    
     def _build_conversation_prompt(self, current_message: str, context: Optional[List[Dict[str, str]]] = None) -> str:
         """
         Build conversation prompt with history.
@@ -301,35 +733,154 @@ class OllamaProvider(BaseAIProvider):
         Returns:
             Formatted prompt string
         """
-        # Use provided context or fall back to internal history
-        history = context if context is not None else self.conversation_history
+        if context is not None:
+            prefix = self._render_prompt_prefix(context)
+        else:
+            if self._prompt_prefix is None:
+                self._prompt_prefix = self._render_prompt_prefix(self.conversation_history)
+            prefix = self._prompt_prefix
         
-        # Start with system prompt
-        prompt = f"{self.system_prompt}\n\n"
+        # Add current message
+        return f"{prefix}User: {current_message}\nCarlos:"
+    
+    def _render_prompt_prefix(self, history: Sequence[Dict[str, str]]) -> str:
+        """
+        Render the system prompt, summary and history for /api/generate.
+        
+        Args:
+            history: Conversation entries to include
+            
+        Returns:
+            Prompt text preceding the current message
+        """
+        role_prefix = self._role_prefix
+        
+        # Start with system prompt and summary of earlier turns
+        parts = [self._system_prefix, self._summary_prefix]
+        append = parts.append
         
         # Add conversation history
         for entry in history:
-            role = entry.get('role', '')
-            content = entry.get('content', '')
-            
-            if role == 'user':
-                prompt += f"User: {content}\n"
-            elif role == 'assistant':
-                prompt += f"Carlos: {content}\n"
+            append(role_prefix[entry["role"]])
+            append(entry["content"])
+            append("\n")
         
-        # Add current message
-        prompt += f"User: {current_message}\nCarlos:"
+        return "".join(parts)
+    
+    def add_to_history(self, role: str, content: str) -> None:
+        """
+        Add message to conversation history and extend the cached prompt prefix.
         
-        return prompt
+        Args:
+            role: 'user' or 'assistant'
+            content: Message content
+        """
+        history = self.conversation_history
+        evicting = history.maxlen is not None and len(history) >= history.maxlen
+        
+        super().add_to_history(role, content)
+        
+        if evicting:
+            # Oldest entry fell out of the window, so the prefix changed
+            self._prompt_prefix = None
+        elif self._prompt_prefix is not None:
+            self._prompt_prefix += f"{self._role_prefix[role]}{content}\n"
     
     def _trim_conversation_history(self) -> None:
-        """Trim conversation history to prevent token overflow."""
-        max_history = 20  # Keep last 20 exchanges
+        """
+        Start summarizing the oldest half of a full history window.
+        
+        The history deque evicts old entries on its own; summarizing them first
+        keeps names, IDs and preferences from early in the session available
+        while the prompt stays bounded. The summary request runs on a
+        background thread and is applied by ``_apply_pending_summary``.
+        """
+        history = self.conversation_history
+        if not self.summarize_history or history.maxlen is None or len(history) < history.maxlen:
+            return
+        if self._summary_thread is not None or self._pending_summary is not None:
+            return
         
-        if len(self.conversation_history) > max_history * 2:  # Each exchange has 2 entries
-            # Keep system prompt and recent history
-            self.conversation_history = self.conversation_history[-max_history * 2:]
-            self.logger.info("Conversation history trimmed")
+        evicted = [history[i] for i in range(history.maxlen // 2)]
+        dialogue = "\n".join(
+            f"{self._role_prefix.get(entry['role'], '')}{entry['content']}" for entry in evicted
+        )
+        
+        summary_prompt = (
+            "Summarize the following dialogue preserving names, IDs, and user preferences:\n"
+        )
+        if self._summary:
+            summary_prompt += f"{self._summary}\n"
+        summary_prompt += dialogue
+        
+        self._summary_thread = threading.Thread(
+            target=self._summarize_in_background, args=(summary_prompt, len(evicted)),
+            name="OllamaSummary", daemon=True
+        )
+        self._summary_thread.start()
+    
+    def _summarize_in_background(self, summary_prompt: str, count: int) -> None:
+        """
+        Request a summary and stash it for the next request.
+        
+        Args:
+            summary_prompt: Prompt asking Ollama to summarize the dialogue
+            count: Number of oldest history entries the summary covers
+        """
+        summary = self._make_request(summary_prompt)
+        if not summary:
+            self.logger.warning("Failed to summarize conversation history - oldest turns will be dropped")
+            return
+        
+        self._pending_summary = (count, summary.strip())
+    
+    def _apply_pending_summary(self) -> None:
+        """Wait for a running summary, then replace the entries it covers with it."""
+        if self._summary_thread is not None:
+            self._summary_thread.join()
+            self._summary_thread = None
+        
+        pending = self._pending_summary
+        if pending is None:
+            return
+        self._pending_summary = None
+        
+        # History only changes on this thread, so the summarized entries are
+        # still the oldest ones
+        count, summary = pending
+        for _ in range(count):
+            self.conversation_history.popleft()
+        
+        self._set_summary(summary)
+        self.logger.info("Conversation history summarized")
+    
+    def _set_summary(self, summary: Optional[str]) -> None:
+        """
+        Update the running summary and the prompt pieces built from it.
+        
+        Args:
+            summary: Summary text or None to clear it
+        """
+        self._summary = summary
+        if summary:
+            header = f"[Summary of earlier conversation]\n{summary}"
+            self._summary_prefix = f"{header}\n\n"
+            self._summary_messages = [{"role": "system", "content": header}]
+        else:
+            self._summary_prefix = ""
+            self._summary_messages = []
+        self._prompt_prefix = None
+    
+    def clear_conversation(self) -> None:
+        """Clear conversation history and any summary of earlier turns."""
+        # Let an in-flight summary finish, then drop it with the history
+        if self._summary_thread is not None:
+            self._summary_thread.join()
+            self._summary_thread = None
+        self._pending_summary = None
+        self._set_summary(None)
+        super().clear_conversation()
+        self._prompt_prefix = None
     
     def get_model_info(self) -> Dict[str, Any]:
         """
@@ -346,3 +897,9 @@ class OllamaProvider(BaseAIProvider):
             "max_tokens": self.max_tokens,
             "connected": self.is_connected
         }
+    
+    def close(self) -> None:
+        """Close the HTTP session and the persistent response cache."""
+        self.session.close()
+        if self._persistent_cache:
+            self._persistent_cache.close()
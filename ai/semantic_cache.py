@@ -0,0 +1,89 @@
+"""
+Semantic Response Cache
+Reuses AI replies for prompts that are paraphrases of earlier ones
+"""
+
+import math
+import operator
+from collections import deque
+from typing import Callable, Deque, List, Optional, Tuple
+
+
+class SemanticCache:
+    """Cache of replies looked up by embedding similarity instead of exact text."""
+    
+    def __init__(self, embed: Callable[[str], Optional[List[float]]],
+                 threshold: float = 0.92, max_entries: int = 512):
+        """
+        Initialize the semantic cache.
+        
+        Args:
+            embed: Callable returning an embedding vector for a text, or None on failure
+            threshold: Minimum cosine similarity for a cached reply to be reused
+            max_entries: Maximum number of cached replies; oldest are evicted
+        """
+        self._embed = embed
+        self.threshold = threshold
+        # (context key, unit-length embedding, reply)
+        self._entries: Deque[Tuple[str, List[float], str]] = deque(maxlen=max_entries)
+    
+    def embed(self, text: str) -> Optional[List[float]]:
+        """
+        Embed a text and normalize it to unit length.
+        
+        Args:
+            text: Text to embed
+        
+        Returns:
+            Unit-length embedding, or None if embedding failed
+        """
+        vector = self._embed(text)
+        if not vector:
+            return None
+        
+        norm = math.sqrt(sum(map(operator.mul, vector, vector)))
+        if norm == 0:
+            return None
+        return [value / norm for value in vector]
+    
+    def lookup(self, embedding: List[float], context_key: str) -> Optional[str]:
+        """
+        Find the cached reply whose prompt is most similar to the given one.
+        
+        Only entries stored under the same context key are considered, so a
+        reply is never reused across different conversation states.
+        
+        Args:
+            embedding: Unit-length embedding from ``embed``
+            context_key: Identifier of the conversation state before the prompt
+        
+        Returns:
+            Cached reply, or None if nothing is similar enough
+        """
+        best_reply = None
+        best_score = self.threshold
+        
+        for key, cached_embedding, reply in self._entries:
+            if key != context_key:
+                continue
+            # Vectors are unit length, so the dot product is the cosine similarity
+            score = sum(map(operator.mul, embedding, cached_embedding))
+            if score >= best_score:
+                best_reply, best_score = reply, score
+        
+        return best_reply
+    
+    def store(self, embedding: List[float], context_key: str, reply: str) -> None:
+        """
+        Cache a reply for a prompt embedding.
+        
+        Args:
+            embedding: Unit-length embedding from ``embed``
+            context_key: Identifier of the conversation state before the prompt
+            reply: Reply to reuse for similar prompts
+        """
+        self._entries.append((context_key, embedding, reply))
+    
+    def clear(self) -> None:
+        """Remove all cached replies."""
+        self._entries.clear()
@@ -6,7 +6,6 @@ Modular voice AI assistant with extensible providers
 
 import os
 import sys
-import yaml
 import signal
 from typing import Dict, Any, Optional
 from utils.logger import get_logger, CarlosLogger
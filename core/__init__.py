@@ -3,4 +3,34 @@ Carlos Core Module
 Core functionality for the Carlos AI Assistant
 """
 
+import os
+import importlib
+
 __version__ = "1.0.0"
+
+# Public names and the submodule that defines them; imported on first access
+_LAZY_EXPORTS = {
+    "CarlosAssistant": ".assistant",
+    "ServiceManager": ".service_manager",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name: str):
+    """Import a public name from its submodule on first access (PEP 562)."""
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted([*globals(), *__all__])
+
+
+# Set CARLOS_EAGER_IMPORT=1 to import everything up front and surface import errors early
+if os.environ.get("CARLOS_EAGER_IMPORT") == "1":
+    for _name in __all__:
+        __getattr__(_name)
@@ -4,14 +4,69 @@ Main assistant logic with provider abstraction
 """
 
 import os
+import re
 import sys
-import yaml
 import signal
-from typing import Dict, Any, Optional
+import logging
+import threading
+import time
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, Optional, TYPE_CHECKING
 from utils.logger import get_logger, CarlosLogger
-from .service_manager import ServiceManager
-from ai.ollama_provider import OllamaProvider
-from speech.tts.alltalk_tts import AllTalkTTS
+
+if TYPE_CHECKING:
+    # Providers pull in requests, pygame etc.; they are imported when initialized
+    from .service_manager import ServiceManager
+    from ai.ollama_provider import OllamaProvider
+    from speech.tts.alltalk_tts import AllTalkTTS
+
+# Commands that end the conversation loop
+EXIT_COMMANDS = frozenset({'quit', 'exit', 'bye'})
+
+# Prefix of the 'voice <name>' command, offered by tab completion
+VOICE_PREFIX = 'voice '
+
+# 'voice <name>' with any whitespace and case; the name keeps its original case.
+# The name is optional so a bare 'voice' gets the usage hint.
+VOICE_RE = re.compile(r'(?i)voice(?:\s+(\S.*))?')
+
+# A complete sentence in streamed text: up to terminal punctuation that is
+# followed by whitespace, or up to a newline
+SENTENCE_RE = re.compile(r'[^\n]*?(?:[.!?]+(?=\s)|\n)')
+
+# JSON schema that config.yaml must satisfy
+CONFIG_SCHEMA_PATH = "config_schema.json"
+
+# Validator compiled from CONFIG_SCHEMA_PATH on first use
+_config_validator = None
+
+# Line-editing history kept between sessions
+HISTORY_FILE = os.path.join(os.path.expanduser("~"), ".carlos_history")
+
+# Seconds to wait for model unload and TTS cleanup on shutdown
+CLEANUP_TIMEOUT = 10
+
+
+@lru_cache(maxsize=4)
+def _format_tts_status(enabled: bool, voice: Optional[str], volume: Optional[float]) -> str:
+    """
+    Format the TTS status line for a given TTS state.
+    
+    Args:
+        enabled: Whether TTS is enabled
+        voice: Current voice, or None if no TTS provider is loaded
+        volume: Current volume (0.0 to 1.0), or None if no TTS provider is loaded
+        
+    Returns:
+        Formatted status line
+    """
+    if not enabled:
+        return "TTS: [--] Disabled"
+    if volume is None:
+        return "TTS: [OK] Enabled"
+    
+    return f"TTS: [OK] Enabled | Voice: {voice} | Volume: {int(volume * 100)}%"
 
 
 class CarlosAssistant:
@@ -21,18 +76,53 @@ class CarlosAssistant:
         """Initialize the assistant."""
         self.config: Optional[Dict[str, Any]] = None
         self.logger: Optional[CarlosLogger] = None
-        self.ai_provider: Optional[OllamaProvider] = None
-        self.tts_provider: Optional[AllTalkTTS] = None
-        self.service_manager: Optional[ServiceManager] = None
+        self.ai_provider: Optional["OllamaProvider"] = None
+        self.tts_provider: Optional["AllTalkTTS"] = None
+        self.service_manager: Optional["ServiceManager"] = None
         self.tts_enabled = True
         self.running = False
         
-        # Setup signal handlers for graceful shutdown
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
+        # Acquired (never released) by the first cleanup; acquire is atomic, so
+        # racing signals and the normal exit path can't both run it
+        self._cleanup_lock = threading.Lock()
+        
+        # Startup messages, written once per step by _flush_output()
+        self._startup_buf = []
+        
+        # Startup sequence as (name, step, fatal); steps return True on success
+        self._startup_steps = [
+            ("config", self.load_configuration, True),
+            ("logger", self.initialize_logger, True),
+            ("service_manager", self.initialize_service_manager, True),
+            ("setup", self._check_setup, True),
+            ("services", self._ensure_services, True),
+            ("providers", self._initialize_providers, True),
+            ("connections", self._test_connections, True)
+        ]
+        
+        # Conversation loop commands
+        self._commands = {
+            'clear': self._cmd_clear,
+            'history': self._show_conversation_history,
+            'mute': self._cmd_mute,
+            'unmute': self._cmd_unmute,
+            'stop': self._cmd_stop,
+            'voices': self._cmd_voices,
+            **dict.fromkeys(EXIT_COMMANDS, self._cmd_quit)
+        }
     
     def _signal_handler(self, signum: int, frame) -> None:
-        """Handle shutdown signals gracefully."""
+        """
+        Handle shutdown signals gracefully.
+        
+        Only stops the conversation loop; raising KeyboardInterrupt unblocks a
+        pending ``input()`` or streamed response, and ``run()`` then performs
+        the single shutdown sequence.
+        """
+        # Let a cleanup that is already running finish
+        if self._cleanup_lock.locked():
+            return
+        
         if self.logger:
             self.logger.info(f"Received signal {signum}, shutting down gracefully...")
         
@@ -40,28 +130,7 @@ class CarlosAssistant:
         
         # Stop conversation loop
         self.running = False
-        
-        # Unload model before services shut down
-        if self.ai_provider:
-            print("[INFO] Unloading model from memory...")
-            if self.logger:
-                self.logger.info("Attempting to unload model before shutdown")
-            self.ai_provider.unload_model()
-            print("[OK] Model unload attempted")
-        
-        # Clean up TTS resources
-        if self.tts_provider:
-            print("[INFO] Cleaning up TTS resources...")
-            self.tts_provider.cleanup()
-            print("[OK] TTS cleanup completed")
-        
-        # Clean shutdown message
-        print("\n[INFO] Carlos Assistant shutting down...")
-        if self.logger:
-            self.logger.info("Carlos Assistant shutting down...")
-        
-        # Exit cleanly
-        sys.exit(0)
+        raise KeyboardInterrupt
     
     def load_configuration(self) -> bool:
         """
@@ -70,42 +139,111 @@ class CarlosAssistant:
         Returns:
             True if successful, False otherwise
         """
+        import yaml
+        
         try:
             config_path = "config.yaml"
             if not os.path.exists(config_path):
-                print(f"[ERROR] Configuration file not found: {config_path}")
+                self._say(f"[ERROR] Configuration file not found: {config_path}")
                 return False
             
-            with open(config_path, 'r', encoding='utf-8') as file:
-                self.config = yaml.safe_load(file)
-            
-            # Validate required configuration sections
-            required_sections = ['general', 'logging']
-            for section in required_sections:
-                if section not in self.config:
-                    print(f"[ERROR] Missing required configuration section: {section}")
-                    return False
+            self.config = self._read_config_file(config_path)
             
-            # Check for AI provider configuration
-            if 'ai' not in self.config and 'ollama' not in self.config:
-                print("[ERROR] No AI provider configuration found")
+            # Validate required sections with the compiled schema
+            if not self._validate_config():
                 return False
             
             # Check for TTS provider configuration
-            if 'speech' not in self.config and 'alltalk_tts' not in self.config:
-                print("[WARNING] No TTS configuration found - TTS will be disabled")
+            if self.config.keys().isdisjoint({'speech', 'alltalk_tts'}):
+                self._say("[WARNING] No TTS configuration found - TTS will be disabled")
                 self.tts_enabled = False
             
-            print("[OK] Configuration loaded successfully")
+            self._say("[OK] Configuration loaded successfully")
             return True
             
         except yaml.YAMLError as e:
-            print(f"[ERROR] Error parsing configuration file: {e}")
+            self._say(f"[ERROR] Error parsing configuration file: {e}")
             return False
         except Exception as e:
-            print(f"[ERROR] Error loading configuration: {e}")
+            self._say(f"[ERROR] Error loading configuration: {e}")
             return False
     
+    def _validate_config(self) -> bool:
+        """
+        Validate the loaded configuration against config_schema.json.
+        
+        The schema is compiled into a Python validator once per process.
+        
+        Returns:
+            True if the configuration is valid, False otherwise
+        """
+        import fastjsonschema
+        import orjson
+        
+        global _config_validator
+        if _config_validator is None:
+            with open(CONFIG_SCHEMA_PATH, 'rb') as file:
+                _config_validator = fastjsonschema.compile(orjson.loads(file.read()))
+        
+        try:
+            _config_validator(self.config)
+            return True
+        except fastjsonschema.JsonSchemaException as e:
+            self._say(f"[ERROR] Invalid configuration: {e.message}")
+            return False
+    
+    def _read_config_file(self, config_path: str) -> Dict[str, Any]:
+        """
+        Parse a YAML config file, reusing a JSON cache while the file is unchanged.
+        
+        Args:
+            config_path: Path to the YAML configuration file
+            
+        Returns:
+            Parsed configuration dictionary
+        """
+        import orjson
+        
+        cache_path = config_path + ".jsoncache"
+        stat = os.stat(config_path)
+        
+        # Use the cached parse if it was written for this exact mtime and size;
+        # the size catches edits that land within the filesystem's mtime resolution
+        try:
+            with open(cache_path, 'rb') as file:
+                cached = orjson.loads(file.read())
+            if cached["_mtime"] == stat.st_mtime and cached["_size"] == stat.st_size:
+                return cached["data"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        
+        import yaml
+        
+        # Prefer the libyaml-backed loader when PyYAML was built with it; a binary
+        # handle lets it detect the encoding and decode in C
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        try:
+            with open(config_path, 'rb') as file:
+                config = yaml.load(file, Loader=loader)
+        except yaml.YAMLError:
+            # Don't leave a cache behind for a config that no longer parses
+            try:
+                os.remove(cache_path)
+            except OSError:
+                pass
+            raise
+        
+        # Write the cache atomically; failing to cache is not an error
+        tmp_path = cache_path + ".tmp"
+        try:
+            with open(tmp_path, 'wb') as file:
+                file.write(orjson.dumps({"_mtime": stat.st_mtime, "_size": stat.st_size, "data": config}))
+            os.replace(tmp_path, cache_path)
+        except (OSError, TypeError, ValueError):
+            pass
+        
+        return config
+    
     def initialize_logger(self) -> bool:
         """
         Initialize the logging system.
@@ -116,10 +254,10 @@ class CarlosAssistant:
         try:
             self.logger = get_logger("Carlos", self.config)
             self.logger.info("Carlos Assistant starting up...")
-            print("[OK] Logger initialized successfully")
+            self._say("[OK] Logger initialized successfully")
             return True
         except Exception as e:
-            print(f"[ERROR] Error initializing logger: {e}")
+            self._say(f"[ERROR] Error initializing logger: {e}")
             return False
     
     def initialize_service_manager(self) -> bool:
@@ -130,11 +268,18 @@ class CarlosAssistant:
             True if successful, False otherwise
         """
         try:
-            self.service_manager = ServiceManager(self.logger)
-            print("[OK] Service Manager initialized successfully")
+            from .service_manager import ServiceManager
+            
+            # Launch Ollama with the same keep-alive the provider requests
+            ollama_config = (self.config.get('ai', {}).get('providers', {}).get('ollama')
+                             or self.config.get('ollama', {}))
+            self.service_manager = ServiceManager(
+                self.logger, ollama_keep_alive=ollama_config.get('keep_alive', '30m')
+            )
+            self._say("[OK] Service Manager initialized successfully")
             return True
         except Exception as e:
-            print(f"[ERROR] Error initializing service manager: {e}")
+            self._say(f"[ERROR] Error initializing service manager: {e}")
             return False
     
     def initialize_ai_provider(self) -> bool:
@@ -145,13 +290,16 @@ class CarlosAssistant:
             True if successful, False otherwise
         """
         try:
+            from ai.ollama_provider import OllamaProvider
+            
             # For now, we only support Ollama
             self.ai_provider = OllamaProvider(self.config, self.logger)
-            print("[OK] AI Provider initialized successfully")
+            self._say("[OK] AI Provider initialized successfully")
             return True
         except Exception as e:
-            self.logger.error(f"Error initializing AI provider: {e}", exc_info=True)
-            print(f"[ERROR] Error initializing AI provider: {e}")
+            self.logger.error("Error initializing AI provider: %s", e,
+                              exc_info=self.logger.is_enabled_for(logging.DEBUG))
+            self._say(f"[ERROR] Error initializing AI provider: {e}")
             return False
     
     def initialize_tts_provider(self) -> bool:
@@ -162,18 +310,21 @@ class CarlosAssistant:
             True if successful, False otherwise
         """
         if not self.tts_enabled:
-            print("[INFO] TTS disabled - skipping TTS provider initialization")
+            self._say("[INFO] TTS disabled - skipping TTS provider initialization")
             return True
         
         try:
+            from speech.tts.alltalk_tts import AllTalkTTS
+            
             # For now, we only support AllTalk
             self.tts_provider = AllTalkTTS(self.config, self.logger)
-            print("[OK] TTS Provider initialized successfully")
+            self._say("[OK] TTS Provider initialized successfully")
             return True
         except Exception as e:
-            self.logger.error(f"Error initializing TTS provider: {e}", exc_info=True)
-            print(f"[WARNING] Error initializing TTS provider: {e}")
-            print("[INFO] Continuing without TTS functionality...")
+            self.logger.error("Error initializing TTS provider: %s", e,
+                              exc_info=self.logger.is_enabled_for(logging.DEBUG))
+            self._say(f"[WARNING] Error initializing TTS provider: {e}")
+            self._say("[INFO] Continuing without TTS functionality...")
             self.tts_enabled = False
             return True  # Don't fail startup for TTS issues
     
@@ -223,18 +374,30 @@ class CarlosAssistant:
         Returns:
             True if successful, False otherwise
         """
-        print("[INFO] Testing connection to AI provider...")
+        self._say("[INFO] Testing connection to AI provider...")
         
-        if not self.ai_provider.test_connection():
-            print("[ERROR] Failed to connect to AI provider")
-            print("\nTroubleshooting steps:")
-            print("1. Make sure Ollama is installed and running")
-            print("2. Verify the model is available")
-            print("3. Check if Ollama is running on http://localhost:11434")
-            print("4. Try running: ollama list")
+        # Reuse the model list fetched by the service manager's readiness probe,
+        # but only if it probed the same server the provider talks to
+        tags = None
+        if self.service_manager:
+            from .service_manager import OLLAMA_URL
+            
+            base_url = getattr(self.ai_provider, 'base_url', '') or ''
+            if base_url.rstrip('/') == OLLAMA_URL:
+                tags = self.service_manager.ollama_tags
+        
+        if not self.ai_provider.test_connection(tags):
+            self._say(
+                "[ERROR] Failed to connect to AI provider\n"
+                "\nTroubleshooting steps:\n"
+                "1. Make sure Ollama is installed and running\n"
+                "2. Verify the model is available\n"
+                "3. Check if Ollama is running on http://localhost:11434\n"
+                "4. Try running: ollama list"
+            )
             return False
         
-        print("[OK] Connected to AI provider successfully")
+        self._say("[OK] Connected to AI provider successfully")
         return True
     
     def test_tts_connection(self) -> bool:
@@ -247,98 +410,191 @@ class CarlosAssistant:
         if not self.tts_enabled or not self.tts_provider:
             return True
         
-        print("[INFO] Testing connection to TTS provider...")
+        self._say("[INFO] Testing connection to TTS provider...")
         
         if not self.tts_provider.test_connection():
-            print("[WARNING] Failed to connect to TTS provider - continuing without TTS")
+            self._say("[WARNING] Failed to connect to TTS provider - continuing without TTS")
             self.tts_enabled = False
             return True
         
-        print("[OK] Connected to TTS provider successfully")
+        self._say("[OK] Connected to TTS provider successfully")
         return True
     
     def startup(self) -> bool:
         """
         Perform startup sequence.
         
+        Runs each step in ``self._startup_steps`` in order. A failing fatal
+        step aborts startup; a failing non-fatal step is only logged.
+        
         Returns:
             True if successful, False otherwise
         """
-        print(">>> Carlos AI Assistant v2.0 - Modular Architecture")
-        print("=" * 50)
+        sys.stdout.write(">>> Carlos AI Assistant v2.0 - Modular Architecture\n" + "=" * 50 + "\n")
         
-        # Load configuration
-        if not self.load_configuration():
-            return False
+        for name, step, fatal in self._startup_steps:
+            try:
+                ok = step()
+            finally:
+                self._flush_output()
+            if ok:
+                continue
+            if fatal:
+                if self.logger:
+                    self.logger.error(f"Startup step '{name}' failed - aborting")
+                return False
+            if self.logger:
+                self.logger.warning(f"Startup step '{name}' failed - continuing")
         
-        # Initialize logger
-        if not self.initialize_logger():
-            return False
+        # Show TTS status and the ready banner in one write
+        sys.stdout.write(f"{self._tts_status_line()}\n{'=' * 50}\n[SUCCESS] Carlos is ready to chat with voice!\n")
+        return True
+    
+    def _say(self, message: str = "") -> None:
+        """
+        Queue a startup message; ``_flush_output`` writes queued messages at once.
         
-        # Initialize service manager
-        if not self.initialize_service_manager():
-            return False
+        Args:
+            message: Line to print
+        """
+        self._startup_buf.append(message)
+    
+    def _flush_output(self) -> None:
+        """Write all queued startup messages with a single stdout write."""
+        if self._startup_buf:
+            sys.stdout.write("\n".join(self._startup_buf) + "\n")
+            sys.stdout.flush()
+            self._startup_buf.clear()
+    
+    def _check_setup(self) -> bool:
+        """
+        Check that setup.py has been run.
         
-        # Check if setup was completed
-        if not self.service_manager.check_setup_completion():
-            print("❌ Setup not completed!")
-            print("Please run: python setup.py")
-            print("\nThis will install all required dependencies and configure Carlos.")
-            return False
+        Returns:
+            True if setup was completed, False otherwise
+        """
+        if self.service_manager.check_setup_completion():
+            return True
         
-        # Smart service management
-        print("[INFO] Checking and starting services...")
+        self._say(
+            "[ERROR] Setup not completed!\n"
+            "Please run: python setup.py\n"
+            "\nThis will install all required dependencies and configure Carlos."
+        )
+        return False
+    
+    def _ensure_services(self) -> bool:
+        """
+        Make sure Ollama and AllTalk are running, disabling TTS if AllTalk is not.
+        
+        Returns:
+            True if Ollama is available, False otherwise
+        """
+        self._say("[INFO] Checking and starting services...")
+        
+        # Show progress before the potentially slow service startup
+        self._flush_output()
         service_status = self.service_manager.ensure_all_services()
         
         if not service_status['ollama']:
-            print("❌ Cannot start Ollama. Please run setup.py again.")
-            print("💡 Make sure Ollama is installed from: https://ollama.ai/")
+            self._say("[ERROR] Cannot start Ollama. Please run setup.py again.")
+            self._say("[INFO] Make sure Ollama is installed from: https://ollama.ai/")
             return False
         
         if not service_status['alltalk']:
-            print("⚠️ AllTalk TTS unavailable - continuing in text-only mode")
+            self._say("[WARNING] AllTalk TTS unavailable - continuing in text-only mode")
             self.tts_enabled = False
         
-        # Initialize AI provider
-        if not self.initialize_ai_provider():
-            return False
+        return True
+    
+    def _initialize_providers(self) -> bool:
+        """
+        Construct the AI and TTS providers concurrently.
         
-        # Initialize TTS provider
-        if not self.initialize_tts_provider():
-            return False
+        Returns:
+            True if the AI provider was initialized, False otherwise
+        """
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            ai_future = executor.submit(self.initialize_ai_provider)
+            tts_future = executor.submit(self.initialize_tts_provider)
+            
+            return ai_future.result() and tts_future.result()
+    
+    def _test_connections(self) -> bool:
+        """
+        Test the AI and TTS connections concurrently.
         
-        # Test AI connection
-        if not self.test_ai_connection():
-            return False
+        A TTS failure only disables TTS (see ``test_tts_connection``).
         
-        # Test TTS connection (only if enabled)
-        if self.tts_enabled and not self.test_tts_connection():
-            print("⚠️ TTS connection failed - continuing in text-only mode")
-            self.tts_enabled = False
+        Returns:
+            True if the AI provider is reachable, False otherwise
+        """
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            ai_future = executor.submit(self.test_ai_connection)
+            tts_future = executor.submit(self.test_tts_connection)
+            
+            tts_future.result()
+            return ai_future.result()
+    
+    def _tts_status_line(self) -> str:
+        """
+        Format the TTS status line shown at startup.
         
-        # Show TTS status
-        tts_status = "✅ Enabled" if self.tts_enabled else "❌ Disabled"
-        voice_info = f" | Voice: {self.tts_provider.voice}" if self.tts_enabled and self.tts_provider else ""
-        volume_info = f" | Volume: {int(self.tts_provider.volume * 100)}%" if self.tts_enabled and self.tts_provider else ""
+        Returns:
+            TTS state, plus voice and volume when TTS is active
+        """
+        provider = self.tts_provider
+        if not provider:
+            return _format_tts_status(self.tts_enabled, None, None)
         
-        print(f"TTS: {tts_status}{voice_info}{volume_info}")
-        print("=" * 50)
-        print("[SUCCESS] Carlos is ready to chat with voice!")
-        return True
+        # The state is the cache key, so mute/unmute/voice changes need no invalidation
+        return _format_tts_status(self.tts_enabled, provider.voice, provider.volume)
+    
+    def _setup_readline(self) -> None:
+        """Enable line editing, input history and command completion when readline is available."""
+        try:
+            import readline
+            import atexit
+        except ImportError:
+            return
+        
+        readline.set_history_length(1000)
+        try:
+            readline.read_history_file(HISTORY_FILE)
+        except OSError:
+            pass
+        
+        def save_history() -> None:
+            try:
+                readline.write_history_file(HISTORY_FILE)
+            except OSError:
+                pass
+        
+        atexit.register(save_history)
+        
+        # Complete against the dispatch table so no per-keystroke work is needed
+        commands = sorted([*self._commands, VOICE_PREFIX])
+        
+        def complete(text: str, state: int) -> Optional[str]:
+            matches = [cmd for cmd in commands if cmd.startswith(text.lower())]
+            return matches[state] if state < len(matches) else None
+        
+        readline.set_completer(complete)
+        readline.set_completer_delims("")
+        readline.parse_and_bind("tab: complete")
     
     def conversation_loop(self) -> None:
         """Main conversation loop."""
         self.running = True
+        self._setup_readline()
         
-        print("\nType your message (or 'quit', 'exit', 'bye' to exit)")
-        print("Commands: 'clear', 'history', 'mute', 'unmute', 'voices', 'voice <name>', 'stop'")
-        
-        # Show current TTS status
-        tts_status = "✅ Enabled" if self.tts_enabled else "❌ Disabled"
-        voice_info = f" | Voice: {self.tts_provider.voice}" if self.tts_enabled and self.tts_provider else ""
-        volume_info = f" | Volume: {int(self.tts_provider.volume * 100)}%" if self.tts_enabled and self.tts_provider else ""
-        print(f"TTS: {tts_status}{voice_info}{volume_info}")
-        print("-" * 50)
+        # Show usage and current TTS status in one write
+        sys.stdout.write(
+            "\nType your message (or 'quit', 'exit', 'bye' to exit)\n"
+            "Commands: 'clear', 'history', 'mute', 'unmute', 'voices', 'voice <name>', 'stop'\n"
+            f"{self._tts_status_line()}\n"
+            f"{'-' * 50}\n"
+        )
         
         while self.running:
             try:
@@ -348,123 +604,144 @@ class CarlosAssistant:
                 if not user_input:
                     continue
                 
-                # Handle exit commands
-                if user_input.lower() in ['quit', 'exit', 'bye']:
-                    print("\n[INFO] Shutting down Carlos...")
-                    self.logger.info("User requested shutdown")
-                    
-                    # Stop any current TTS
-                    if self.tts_provider:
-                        self.tts_provider.stop_speaking()
-                    
-                    # Unload model while AI provider is still running
-                    print("[INFO] Unloading model from memory...")
-                    self.ai_provider.unload_model()
-                    print("[OK] Model unload attempted")
-                    
-                    # Clean up TTS
-                    if self.tts_provider:
-                        print("[INFO] Cleaning up TTS resources...")
-                        self.tts_provider.cleanup()
-                        print("[OK] TTS cleanup completed")
-                    
-                    print("[INFO] Goodbye!")
-                    self.logger.info("Carlos Assistant shutting down normally")
-                    break
-                
-                # Handle special commands
-                if user_input.lower() == 'clear':
-                    self.ai_provider.clear_conversation()
-                    print("[INFO] Conversation history cleared")
-                    continue
-                
-                if user_input.lower() == 'history':
-                    self._show_conversation_history()
-                    continue
-                
-                # TTS Commands
-                if user_input.lower() == 'mute':
-                    self.tts_enabled = False
-                    if self.tts_provider:
-                        self.tts_provider.stop_speaking()
-                    print("[INFO] TTS muted - responses will be text only")
-                    continue
-                
-                if user_input.lower() == 'unmute':
-                    if self.tts_provider:
-                        self.tts_enabled = True
-                        print("[INFO] TTS enabled - responses will include speech")
-                    else:
-                        print("[WARNING] TTS provider not available - cannot unmute")
-                    continue
-                
-                if user_input.lower() == 'stop':
-                    if self.tts_provider:
-                        self.tts_provider.stop_speaking()
-                        print("[INFO] Speech stopped")
-                    else:
-                        print("[INFO] No TTS available to stop")
+                # Handle commands with a single lookup on the lowered input
+                cmd = user_input.lower()
+                if len(cmd) < 16:
+                    # Command names are interned literals, so lookups hit on identity;
+                    # longer input is never a command and stays out of the intern table
+                    cmd = sys.intern(cmd)
+                handler = self._commands.get(cmd)
+                if handler:
+                    handler()
                     continue
                 
-                if user_input.lower() == 'voices':
-                    if self.tts_provider:
-                        voices = self.tts_provider.get_available_voices()
-                        if voices:
-                            print(f"\n[INFO] Available voices ({len(voices)}):")
-                            for i, voice in enumerate(voices, 1):
-                                current = " (current)" if voice == self.tts_provider.voice else ""
-                                print(f"  {i}. {voice}{current}")
-                        else:
-                            print("[INFO] No voices available or unable to fetch voice list")
-                    else:
-                        print("[WARNING] TTS provider not available")
-                    continue
-                
-                if user_input.lower().startswith('voice '):
-                    voice_name = user_input[6:].strip()  # Remove 'voice ' prefix
-                    if self.tts_provider and voice_name:
-                        if self.tts_provider.set_voice(voice_name):
-                            print(f"[OK] Voice changed to: {voice_name}")
-                        else:
-                            print(f"[ERROR] Failed to change voice to: {voice_name}")
-                            voices = self.tts_provider.get_available_voices()
-                            if voices:
-                                print(f"Available voices: {', '.join(voices)}")
-                    else:
-                        if not self.tts_provider:
-                            print("[WARNING] TTS provider not available")
-                        else:
-                            print("[ERROR] Please specify a voice name (e.g., 'voice default')")
+                voice_match = VOICE_RE.fullmatch(user_input)
+                if voice_match:
+                    self._cmd_voice(voice_match.group(1) or "")
                     continue
                 
                 # Send message to AI provider
-                print("[INFO] Carlos is thinking...")
-                response = self.ai_provider.send_message(user_input)
-                print(f"\nCarlos: {response}")
-                
-                # Speak the response if TTS is enabled
-                if self.tts_enabled and self.tts_provider:
-                    print("[🔊] Speaking...")
-                    if not self.tts_provider.speak(response):
-                        print("[WARNING] Failed to generate speech - continuing with text only")
+                self._respond(user_input)
                 
             except (EOFError, KeyboardInterrupt):
+                # Cleanup happens once in shutdown() after the loop exits
                 print("\n\n[INFO] Interrupted by user, shutting down...")
                 self.logger.info("User interrupted with Ctrl+C")
-                
-                # Unload model before shutdown
-                if self.ai_provider:
-                    print("[INFO] Unloading model from memory...")
-                    self.ai_provider.unload_model()
-                    print("[OK] Model unload attempted")
-                
-                print("[INFO] Goodbye!")
-                break
+                self.running = False
             except Exception as e:
-                self.logger.error(f"Error in conversation loop: {e}", exc_info=True)
+                self.logger.error("Error in conversation loop: %s", e,
+                                  exc_info=self.logger.is_enabled_for(logging.DEBUG))
                 print(f"\n[ERROR] An error occurred: {e}")
                 print("Please try again or restart the application.")
     
+    def _respond(self, user_input: str) -> None:
+        """
+        Stream the AI response to the console, speaking it sentence by sentence.
+        
+        Args:
+            user_input: User message to send to the AI provider
+        """
+        print("[INFO] Carlos is thinking...")
+        print("\nCarlos: ", end="", flush=True)
+        
+        speak = self.tts_enabled and self.tts_provider is not None
+        spoken_ok = True
+        unspoken = ""
+        
+        # Show the response as it streams in and hand finished sentences to TTS
+        parts = []
+        for chunk in self.ai_provider.stream_message(user_input):
+            print(chunk, end="", flush=True)
+            parts.append(chunk)
+            
+            if speak:
+                unspoken += chunk
+                consumed = 0
+                for match in SENTENCE_RE.finditer(unspoken):
+                    spoken_ok &= self.tts_provider.speak_chunk(match.group())
+                    consumed = match.end()
+                unspoken = unspoken[consumed:]
+        
+        if not any(parts):
+            unspoken = "Failed to get response from Ollama"
+            print(unspoken, end="")
+        print()
+        
+        # Speak whatever is left and wait for playback, as before streaming
+        if speak:
+            if unspoken.strip():
+                spoken_ok &= self.tts_provider.speak_chunk(unspoken)
+            if not self.tts_provider.wait_until_done() or not spoken_ok:
+                print("[WARNING] Failed to generate speech - continuing with text only")
+    
+    def _cmd_quit(self) -> None:
+        """Handle the quit/exit/bye commands; shutdown() runs once the loop exits."""
+        self.logger.info("User requested shutdown")
+        self.running = False
+    
+    def _cmd_clear(self) -> None:
+        """Handle the clear command."""
+        self.ai_provider.clear_conversation()
+        print("[INFO] Conversation history cleared")
+    
+    def _cmd_mute(self) -> None:
+        """Handle the mute command."""
+        self.tts_enabled = False
+        if self.tts_provider:
+            self.tts_provider.stop_speaking()
+        print("[INFO] TTS muted - responses will be text only")
+    
+    def _cmd_unmute(self) -> None:
+        """Handle the unmute command."""
+        if self.tts_provider:
+            self.tts_enabled = True
+            print("[INFO] TTS enabled - responses will include speech")
+        else:
+            print("[WARNING] TTS provider not available - cannot unmute")
+    
+    def _cmd_stop(self) -> None:
+        """Handle the stop command."""
+        if self.tts_provider:
+            self.tts_provider.stop_speaking()
+            print("[INFO] Speech stopped")
+        else:
+            print("[INFO] No TTS available to stop")
+    
+    def _cmd_voices(self) -> None:
+        """Handle the voices command."""
+        if self.tts_provider:
+            voices = self.tts_provider.get_available_voices()
+            if voices:
+                print(f"\n[INFO] Available voices ({len(voices)}):")
+                for i, voice in enumerate(voices, 1):
+                    current = " (current)" if voice == self.tts_provider.voice else ""
+                    print(f"  {i}. {voice}{current}")
+            else:
+                print("[INFO] No voices available or unable to fetch voice list")
+        else:
+            print("[WARNING] TTS provider not available")
+    
+    def _cmd_voice(self, voice_name: str) -> None:
+        """
+        Handle the voice <name> command.
+        
+        Args:
+            voice_name: Name of the voice to switch to
+        """
+        if self.tts_provider and voice_name:
+            if self.tts_provider.set_voice(voice_name):
+                print(f"[OK] Voice changed to: {voice_name}")
+            else:
+                print(f"[ERROR] Failed to change voice to: {voice_name}")
+                voices = self.tts_provider.get_available_voices()
+                if voices:
+                    print(f"Available voices: {', '.join(voices)}")
+        else:
+            if not self.tts_provider:
+                print("[WARNING] TTS provider not available")
+            else:
+                print("[ERROR] Please specify a voice name (e.g., 'voice default')")
+    
     def _show_conversation_history(self) -> None:
         """Show conversation history."""
         history = self.ai_provider.get_conversation_history()
@@ -473,36 +750,96 @@ class CarlosAssistant:
             print("[INFO] No conversation history yet")
             return
         
-        print("\n[INFO] Conversation History:")
-        print("-" * 30)
+        lines = ["\n[INFO] Conversation History:", "-" * 30]
         
         for i, entry in enumerate(history, 1):
             role = "You" if entry["role"] == "user" else "Carlos"
             content = entry["content"]
             if len(content) > 100:
                 content = content[:97] + "..."
-            print(f"{i:2d}. {role}: {content}")
+            lines.append(f"{i:2d}. {role}: {content}")
+        
+        lines.append("-" * 30)
         
-        print("-" * 30)
+        # One write for the whole listing instead of one per entry
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def shutdown(self) -> None:
-        """Simplified shutdown that ensures proper cleanup order."""
+        """
+        Simplified shutdown that ensures proper cleanup order.
+        
+        Only the first call does any work. The cleanup lock is taken before
+        anything else, so a signal arriving mid-shutdown is ignored by
+        ``_signal_handler`` instead of interrupting the cleanup.
+        """
+        if not self._cleanup_lock.acquire(blocking=False):
+            return
+        
         self.running = False
         if self.logger:
             self.logger.info("Carlos Assistant shutting down...")
         print("\n[INFO] Shutting down Carlos Assistant...")
         
         # Unload model first while services are still running
+        self._parallel_cleanup()
+        
+        print("[INFO] Goodbye!")
+    
+    def _unload_ai_provider(self) -> None:
+        """Unload the model and release the AI provider's connections."""
+        if self.logger:
+            self.logger.info("Attempting to unload model before shutdown")
+        self.ai_provider.unload_model()
+        self.ai_provider.close()
+    
+    def _parallel_cleanup(self) -> None:
+        """
+        Unload the model and clean up TTS resources concurrently.
+        
+        Both teardowns are independent I/O, so they run on separate threads.
+        """
+        tasks = []
         if self.ai_provider:
             print("[INFO] Unloading model from memory...")
-            self.ai_provider.unload_model()
-            print("[OK] Model unload attempted")
-        
-        # Clean up TTS resources
+            tasks.append(self._unload_ai_provider)
         if self.tts_provider:
             print("[INFO] Cleaning up TTS resources...")
-            self.tts_provider.cleanup()
-            print("[OK] TTS cleanup completed")
+            tasks.append(self.tts_provider.cleanup)
+        
+        if not tasks:
+            return
+        
+        # Daemon threads rather than an executor: concurrent.futures joins its
+        # workers at interpreter exit, so a hung teardown would block exit
+        threads = [
+            threading.Thread(target=self._run_cleanup_task, args=(task,),
+                             name="CarlosCleanup", daemon=True)
+            for task in tasks
+        ]
+        for thread in threads:
+            thread.start()
+        
+        deadline = time.monotonic() + CLEANUP_TIMEOUT
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        
+        if any(thread.is_alive() for thread in threads):
+            print(f"[WARNING] Cleanup did not finish within {CLEANUP_TIMEOUT} seconds")
+        else:
+            print("[OK] Model unload and TTS cleanup completed")
+    
+    def _run_cleanup_task(self, task: Callable[[], Any]) -> None:
+        """
+        Run one shutdown task, logging instead of raising on failure.
+        
+        Args:
+            task: Cleanup callable
+        """
+        try:
+            task()
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Error during shutdown cleanup: {e}")
     
     def run(self) -> int:
         """
@@ -511,6 +848,12 @@ class CarlosAssistant:
         Returns:
             Exit code (0 for success, 1 for error)
         """
+        # Setup signal handlers for graceful shutdown, keeping the previous ones
+        previous_handlers = {
+            signum: signal.signal(signum, self._signal_handler)
+            for signum in (signal.SIGINT, signal.SIGTERM)
+        }
+        
         try:
             # Startup sequence
             if not self.startup():
@@ -518,14 +861,23 @@ class CarlosAssistant:
             
             # Main conversation loop
             self.conversation_loop()
-            
-            # Graceful shutdown
-            self.shutdown()
             return 0
             
+        except KeyboardInterrupt:
+            # Signal received before the conversation loop started
+            return 0
         except Exception as e:
             if self.logger:
                 self.logger.critical(f"Unexpected error: {e}", exc_info=True)
             else:
                 print(f"[ERROR] Critical error: {e}")
             return 1
+        finally:
+            try:
+                # Graceful shutdown; the only place cleanup runs. Nothing needs
+                # cleaning up if startup failed before any provider existed.
+                if self.ai_provider or self.tts_provider:
+                    self.shutdown()
+            finally:
+                for signum, handler in previous_handlers.items():
+                    signal.signal(signum, handler)
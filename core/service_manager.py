@@ -5,75 +5,162 @@ Handles auto-starting services and intelligent fallbacks
 
 import os
 import sys
-import time
-import subprocess
 import platform
-import requests
-from typing import Dict, Any, Optional
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, Optional, Tuple
 from pathlib import Path
 from utils.logger import CarlosLogger
+from utils.http import CONNECT_TIMEOUT, create_session, is_listening
+from utils.polling import wait_until
+
+
+# Local endpoints probed for liveness
+OLLAMA_URL = "http://localhost:11434"
+ALLTALK_URL = "http://localhost:7851"
+
+# Known install locations checked when ollama is not on PATH (Windows)
+OLLAMA_PATHS = (
+    r"C:\Program Files\Ollama\ollama.exe",
+    r"C:\ProgramData\chocolatey\bin\ollama.exe"
+)
+
+# Liveness probe (connect, read) timeout in seconds; services are on localhost,
+# so a healthy one answers almost instantly and a longer wait only slows the
+# failure path
+PROBE_TIMEOUT = (CONNECT_TIMEOUT, 2)
 
 
 class ServiceManager:
     """Manages external services for Carlos Assistant."""
     
-    def __init__(self, logger: CarlosLogger):
-        """Initialize the service manager."""
+    def __init__(self, logger: CarlosLogger, ollama_keep_alive: Optional[str] = None):
+        """
+        Initialize the service manager.
+        
+        Args:
+            logger: Logger instance
+            ollama_keep_alive: Default model keep-alive for an Ollama server we
+                start (OLLAMA_KEEP_ALIVE); None leaves Ollama's own default
+        """
         self.logger = logger
         self.project_root = Path.cwd()
         self.alltalk_dir = self.project_root / "alltalk_tts"
+        
+        self._is_windows = platform.system() == "Windows"
+        
+        # Resolve the Ollama executable once instead of searching on every start
+        self._ollama_exe = shutil.which("ollama") or next(
+            (path for path in OLLAMA_PATHS if Path(path).exists()), None
+        )
+        
+        # Environment for an Ollama server we launch, so models stay loaded
+        # between turns even for requests that don't send keep_alive
+        self._ollama_env = None
+        if ollama_keep_alive is not None:
+            self._ollama_env = {**os.environ, "OLLAMA_KEEP_ALIVE": str(ollama_keep_alive)}
+        
+        # Shared session so repeated liveness probes reuse connections; no
+        # retries, since callers already poll until the service is up
+        self._session = create_session(pool_maxsize=4)
+        
+        # Setup completion can't be undone while running, so cache it once seen
+        self._setup_ok = False
+        
+        # Parsed /api/tags from the last successful probe of OLLAMA_URL
+        self.ollama_tags: Optional[Dict[str, Any]] = None
+        
+        # Last known service status: key -> (monotonic timestamp, running)
+        self._status_cache: Dict[str, Tuple[float, bool]] = {}
+    
+    def _cached(self, key: str, fn: Callable[[], bool], ttl: float = 5.0) -> bool:
+        """
+        Return a recent status result, refreshing it once it is older than ttl.
+        
+        Args:
+            key: Cache key for the status
+            fn: Callable that performs the actual check
+            ttl: Number of seconds a cached result stays fresh
+            
+        Returns:
+            The cached or freshly checked status
+        """
+        cached = self._status_cache.get(key)
+        now = time.monotonic()
+        if cached and now - cached[0] < ttl:
+            return cached[1]
+        
+        status = fn()
+        self._status_cache[key] = (now, status)
+        return status
     
     def check_ollama_running(self) -> bool:
         """Check if Ollama service is running."""
+        import orjson
+        
         try:
-            response = requests.get("http://localhost:11434/api/tags", timeout=5)
-            return response.status_code == 200
+            response = self._session.get(f"{OLLAMA_URL}/api/tags", timeout=PROBE_TIMEOUT)
+            if response.status_code != 200:
+                return False
+            
+            # Keep the model list so the AI provider need not fetch it again
+            self.ollama_tags = orjson.loads(response.content)
+            return True
         except Exception:
             return False
     
+    def _service_exists(self, name: str) -> bool:
+        """
+        Check whether a Windows service is installed.
+        
+        Args:
+            name: Service name
+            
+        Returns:
+            True if ``sc query`` knows the service, False otherwise
+        """
+        import subprocess
+        
+        try:
+            result = subprocess.run(['sc', 'query', name],
+                                    stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.DEVNULL)
+            return result.returncode == 0
+        except OSError:
+            return False
+    
     def start_ollama_service(self) -> bool:
         """Attempt to start Ollama service."""
+        import subprocess
+        
         try:
             self.logger.info("Attempting to start Ollama...")
             
-            # Method 1: Try as Windows service
-            if platform.system() == "Windows":
+            # Method 1: Try as Windows service, if one is installed
+            if self._is_windows and self._service_exists("ollama"):
                 result = subprocess.run(['sc', 'start', 'ollama'], 
                                       capture_output=True, text=True)
                 if result.returncode == 0:
-                    time.sleep(3)  # Wait for startup
-                    if self.check_ollama_running():
+                    if wait_until(self.check_ollama_running, timeout=8):
                         self.logger.info("Ollama started via Windows service")
                         return True
             
-            # Method 2: Try direct executable
-            subprocess.Popen(['ollama', 'serve'], 
-                           stdout=subprocess.DEVNULL, 
-                           stderr=subprocess.DEVNULL)
+            # Method 2: Run the resolved executable directly
+            if not self._ollama_exe:
+                self.logger.warning("Ollama executable not found on PATH or in known locations")
+                return False
+            
+            process = subprocess.Popen([self._ollama_exe, 'serve'],
+                                       stdout=subprocess.DEVNULL,
+                                       stderr=subprocess.DEVNULL,
+                                       env=self._ollama_env)
             
             # Wait and test
-            time.sleep(5)
-            if self.check_ollama_running():
-                self.logger.info("Ollama started via direct executable")
+            if wait_until(self.check_ollama_running, timeout=15, process=process):
+                self.logger.info(f"Ollama started via {self._ollama_exe}")
                 return True
             
-            # Method 3: Try with full path (Windows)
-            if platform.system() == "Windows":
-                ollama_paths = [
-                    r"C:\Program Files\Ollama\ollama.exe",
-                    r"C:\ProgramData\chocolatey\bin\ollama.exe"
-                ]
-                
-                for path in ollama_paths:
-                    if Path(path).exists():
-                        subprocess.Popen([path, 'serve'], 
-                                       stdout=subprocess.DEVNULL, 
-                                       stderr=subprocess.DEVNULL)
-                        time.sleep(5)
-                        if self.check_ollama_running():
-                            self.logger.info(f"Ollama started via {path}")
-                            return True
-            
             self.logger.warning("Failed to start Ollama service")
             return False
             
@@ -82,32 +169,13 @@ class ServiceManager:
             return False
     
     def check_alltalk_running(self) -> bool:
-        """Enhanced AllTalk running check"""
-        try:
-            # Test multiple endpoints to be sure
-            test_urls = [
-                "http://localhost:7851/api/voices",
-                "http://localhost:7851/docs",
-                "http://localhost:7851/"
-            ]
-            
-            for url in test_urls:
-                try:
-                    response = requests.get(url, timeout=3)
-                    if response.status_code in [200, 307, 404]:  # Various success codes
-                        self.logger.info(f"AllTalk detected via {url}")
-                        return True
-                except Exception:
-                    continue
-            
-            return False
-            
-        except Exception as e:
-            self.logger.error(f"Error checking AllTalk: {e}")
-            return False
+        """Check if AllTalk is listening, without downloading a response body."""
+        return is_listening(self._session, f"{ALLTALK_URL}/", PROBE_TIMEOUT)
     
     def start_alltalk_service(self) -> bool:
         """Attempt to start AllTalk TTS service."""
+        import subprocess
+        
         try:
             self.logger.info("Attempting to start AllTalk TTS...")
             
@@ -119,15 +187,13 @@ class ServiceManager:
             # Try to start AllTalk server
             start_script = self.alltalk_dir / "start_alltalk.py"
             if start_script.exists():
-                subprocess.Popen([sys.executable, str(start_script)], 
-                               cwd=str(self.alltalk_dir),
-                               stdout=subprocess.DEVNULL, 
-                               stderr=subprocess.DEVNULL)
+                process = subprocess.Popen([sys.executable, str(start_script)],
+                                           cwd=str(self.alltalk_dir),
+                                           stdout=subprocess.DEVNULL,
+                                           stderr=subprocess.DEVNULL)
                 
                 # Wait for startup
-                time.sleep(10)
-                
-                if self.check_alltalk_running():
+                if wait_until(self.check_alltalk_running, timeout=10, process=process):
                     self.logger.info("AllTalk TTS started successfully")
                     return True
             
@@ -145,45 +211,73 @@ class ServiceManager:
         Returns:
             Dictionary with service status
         """
-        services = {
-            'ollama': False,
-            'alltalk': False
-        }
+        # Services are independent, so check and start them concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            ollama_future = executor.submit(self._ensure_ollama)
+            alltalk_future = executor.submit(self._ensure_alltalk)
+            
+            status = {
+                'ollama': ollama_future.result(),
+                'alltalk': alltalk_future.result()
+            }
         
-        # Check Ollama
+        # Seed the status cache so an immediate summary doesn't probe again
+        now = time.monotonic()
+        for key, running in status.items():
+            self._status_cache[key] = (now, running)
+        
+        return status
+    
+    def _ensure_ollama(self) -> bool:
+        """
+        Make sure Ollama is running, starting it if needed.
+        
+        Returns:
+            True if Ollama is running
+        """
         if self.check_ollama_running():
-            services['ollama'] = True
             self.logger.info("Ollama is running")
-        else:
-            self.logger.info("Ollama not running, attempting to start...")
-            if self.start_ollama_service():
-                services['ollama'] = True
-                self.logger.info("Ollama started successfully")
-            else:
-                self.logger.error("Failed to start Ollama")
-        
-        # Check AllTalk TTS
+            return True
+        
+        self.logger.info("Ollama not running, attempting to start...")
+        if self.start_ollama_service():
+            self.logger.info("Ollama started successfully")
+            return True
+        
+        self.logger.error("Failed to start Ollama")
+        return False
+    
+    def _ensure_alltalk(self) -> bool:
+        """
+        Make sure AllTalk TTS is running, starting it if needed.
+        
+        Returns:
+            True if AllTalk TTS is running
+        """
         if self.check_alltalk_running():
-            services['alltalk'] = True
             self.logger.info("AllTalk TTS is running")
-        else:
-            self.logger.info("AllTalk TTS not running, attempting to start...")
-            if self.start_alltalk_service():
-                services['alltalk'] = True
-                self.logger.info("AllTalk TTS started successfully")
-            else:
-                self.logger.warning("AllTalk TTS not available - continuing without TTS")
-        
-        return services
+            return True
+        
+        self.logger.info("AllTalk TTS not running, attempting to start...")
+        if self.start_alltalk_service():
+            self.logger.info("AllTalk TTS started successfully")
+            return True
+        
+        self.logger.warning("AllTalk TTS not available - continuing without TTS")
+        return False
     
     def check_setup_completion(self) -> bool:
         """Check if setup has been completed."""
-        setup_flag = self.project_root / "setup_completed.flag"
-        return setup_flag.exists()
+        if not self._setup_ok:
+            self._setup_ok = (self.project_root / "setup_completed.flag").exists()
+        return self._setup_ok
     
     def get_service_status_summary(self) -> str:
         """Get a summary of all service statuses."""
-        ollama_status = "✅ Running" if self.check_ollama_running() else "❌ Not Running"
-        alltalk_status = "✅ Running" if self.check_alltalk_running() else "❌ Not Running"
+        ollama_running = self._cached('ollama', self.check_ollama_running)
+        alltalk_running = self._cached('alltalk', self.check_alltalk_running)
+        
+        ollama_status = "[OK] Running" if ollama_running else "[--] Not Running"
+        alltalk_status = "[OK] Running" if alltalk_running else "[--] Not Running"
         
         return f"Ollama: {ollama_status} | AllTalk TTS: {alltalk_status}"
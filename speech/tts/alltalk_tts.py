@@ -4,17 +4,48 @@ Provides AllTalk TTS integration for Carlos AI Assistant
 """
 
 import os
-import json
+import re
+import sys
 import time
+import hashlib
+import logging
+import orjson
 import requests
 import threading
 import subprocess
 import pygame
-from typing import Dict, List, Optional, Any
+from collections import deque
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Deque, Dict, FrozenSet, List, Optional, Any
 from utils.logger import CarlosLogger
+from utils.http import CONNECT_TIMEOUT, create_session, is_listening
+from utils.polling import wait_until
 from .base_tts import BaseTTS
 
 
+# Markdown and URL patterns stripped before text is spoken, compiled once
+MD_LINK_RE = re.compile(r'\[([^\]]+)\]\([^)]+\)')
+MD_BOLD_RE = re.compile(r'\*\*([^*]+)\*\*')
+MD_ITALIC_RE = re.compile(r'\*([^*]+)\*')
+CODE_BLOCK_RE = re.compile(r'```[^`]*```')
+INLINE_CODE_RE = re.compile(r'`([^`]+)`')
+URL_RE = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Text without any word character (e.g. a lone "..." chunk) has nothing to say
+SPEAKABLE_RE = re.compile(r'\w')
+
+# (connect, read) timeouts for liveness probes, which return no body
+PROBE_TIMEOUTS = (CONNECT_TIMEOUT, 2)
+
+# Seconds between checks for the end of audio playback
+PLAYBACK_POLL_INTERVAL = 0.02
+
+# Seconds to wait for a freshly started AllTalk server to respond; loading
+# the voice model can take a while, and a server that dies is noticed early
+SERVER_START_TIMEOUT = 60
+
+
 class AllTalkTTS(BaseTTS):
     """AllTalk TTS provider implementation."""
     
@@ -43,11 +74,43 @@ class AllTalkTTS(BaseTTS):
         self.timeout = alltalk_config.get('timeout', 10)
         self.auto_play = alltalk_config.get('auto_play', True)
         
+        # (connect, read) timeouts: fail fast on connect, full budget for synthesis
+        self._timeouts = (CONNECT_TIMEOUT, self.timeout)
+        
+        # Persistent HTTP session; speaking a reply sentence by sentence makes
+        # many short requests
+        self.session = create_session(pool_maxsize=4, retries=2, backoff_factor=0.1)
+        
+        # Voice list cache, so repeated voice commands skip the HTTP round-trip
+        self._voices_cache: Optional[List[str]] = None
+        self._voice_names: FrozenSet[str] = frozenset()
+        self._voices_cache_ts = 0.0
+        self._voices_cache_ttl = alltalk_config.get('voices_cache_ttl', 60)
+        
+        # On-disk cache of generated audio, so repeated phrases skip AllTalk
+        self.audio_cache_dir = alltalk_config.get('audio_cache_dir', 'cache/tts')
+        # Normalized once so cache membership checks survive separators and ./
+        self._audio_cache_key = (
+            os.path.normcase(os.path.abspath(self.audio_cache_dir)) if self.audio_cache_dir else None
+        )
+        self.audio_cache_mb = alltalk_config.get('audio_cache_mb', 100)
+        
         # Audio playback management
         self.current_audio_file = None
-        self.speech_queue = []
+        self.speech_queue: Deque["Future[Optional[str]]"] = deque()
         self.queue_lock = threading.Lock()
         
+        # Background playback of speak_chunk() text; all guarded by queue_lock
+        self._queue_changed = threading.Condition(self.queue_lock)
+        self._pending_chunks = 0
+        self._chunk_failed = False
+        self._queue_epoch = 0  # Bumped by stop_speaking() to drop in-flight chunks
+        self._stopping = False
+        self._playback_thread: Optional[threading.Thread] = None
+        # Generates queued chunks ahead of playback; a single worker keeps
+        # requests to AllTalk serial while the next sentence renders
+        self._generate_executor: Optional[ThreadPoolExecutor] = None
+        
         # Initialize pygame for audio playback
         try:
             pygame.mixer.init()
@@ -66,6 +129,8 @@ class AllTalkTTS(BaseTTS):
         """
         Test connection to AllTalk TTS.
         
+        Also fills the voice list cache from the same response.
+        
         Returns:
             True if connection successful, False otherwise
         """
@@ -73,10 +138,15 @@ class AllTalkTTS(BaseTTS):
             self.logger.info("Testing connection to AllTalk TTS...")
             
             # Test basic connectivity
-            response = requests.get(f"{self.base_url}/api/voices", timeout=self.timeout)
+            response = self.session.get(f"{self.base_url}/api/voices", timeout=self._timeouts)
             
             if response.status_code == 200:
                 self.is_connected = True
+                try:
+                    self._cache_voices(orjson.loads(response.content))
+                except Exception as e:
+                    # The server answered, so a body we cannot parse is not fatal
+                    self.logger.debug(f"Could not cache AllTalk voices: {e}")
                 self.logger.info("Successfully connected to AllTalk TTS")
                 return True
             else:
@@ -130,23 +200,131 @@ class AllTalkTTS(BaseTTS):
             return success
             
         except Exception as e:
-            self.logger.error(f"Error in speak: {e}", exc_info=True)
+            self.logger.error("Error in speak: %s", e,
+                              exc_info=self.logger.is_enabled_for(logging.DEBUG))
             self.is_speaking = False
             return False
     
-    def get_available_voices(self) -> List[str]:
+    def speak_chunk(self, text: str) -> bool:
+        """
+        Queue text to be spoken after any previously queued chunks.
+        
+        Returns immediately. Audio generation starts right away in the
+        background and a worker plays the chunks in order, so the next
+        sentence is rendered while the current one plays and speech can start
+        while the rest of a response is still being produced.
+        
+        Args:
+            text: Text to speak, typically one or more complete sentences
+            
+        Returns:
+            True if the text was queued (or had nothing to speak), False otherwise
+        """
+        if not self.is_connected:
+            self.logger.error("AllTalk TTS not connected")
+            return False
+        
+        cleaned_text = self._clean_text_for_tts(text)
+        if not cleaned_text:
+            return True
+        
+        with self._queue_changed:
+            if self._generate_executor is None:
+                self._generate_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="AllTalkGenerate"
+                )
+            # Start generating now so the audio is ready when earlier chunks finish
+            self.speech_queue.append(self._generate_executor.submit(self.generate_audio, cleaned_text))
+            self._pending_chunks += 1
+            self.is_speaking = True
+            self._queue_changed.notify_all()
+        
+        if self._playback_thread is None or not self._playback_thread.is_alive():
+            self._stopping = False
+            self._playback_thread = threading.Thread(
+                target=self._playback_worker, name="AllTalkPlayback", daemon=True
+            )
+            self._playback_thread.start()
+        
+        return True
+    
+    def wait_until_done(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every chunk passed to ``speak_chunk`` has been spoken.
+        
+        Args:
+            timeout: Maximum number of seconds to wait, or None to wait indefinitely
+            
+        Returns:
+            True if all chunks were spoken successfully, False otherwise
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        with self._queue_changed:
+            while self._pending_chunks:
+                remaining = 0.25 if deadline is None else deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                # Short waits keep Ctrl+C responsive on Windows
+                self._queue_changed.wait(min(remaining, 0.25))
+            
+            success = not self._pending_chunks and not self._chunk_failed
+            self._chunk_failed = False
+        
+        return success
+    
+    def _playback_worker(self) -> None:
+        """Play queued chunks in order as their audio becomes ready, until cleanup."""
+        while True:
+            with self._queue_changed:
+                while not self.speech_queue and not self._stopping:
+                    self._queue_changed.wait()
+                if self._stopping:
+                    return
+                pending_audio = self.speech_queue.popleft()
+                epoch = self._queue_epoch
+            
+            try:
+                audio_file = pending_audio.result()
+            except CancelledError:
+                audio_file = None
+            
+            # Skip playback if stop_speaking() ran while generating
+            if audio_file and epoch == self._queue_epoch:
+                success = self._play_audio_file(audio_file)
+            else:
+                success = audio_file is not None
+                if audio_file:
+                    self._discard_audio_file(audio_file)
+            
+            with self._queue_changed:
+                if epoch == self._queue_epoch:
+                    self._pending_chunks -= 1
+                    self._chunk_failed = self._chunk_failed or not success
+                    self.is_speaking = self._pending_chunks > 0
+                self._queue_changed.notify_all()
+    
+    def get_available_voices(self, refresh: bool = False) -> List[str]:
         """
         Get list of available AllTalk voices.
         
+        Results are cached for ``voices_cache_ttl`` seconds.
+        
+        Args:
+            refresh: If True, bypass the cache and query AllTalk
+            
         Returns:
             List of voice names
         """
+        if (not refresh and self._voices_cache is not None
+                and time.monotonic() - self._voices_cache_ts < self._voices_cache_ttl):
+            return self._voices_cache
+        
         try:
-            response = requests.get(f"{self.base_url}/api/voices", timeout=self.timeout)
+            response = self.session.get(f"{self.base_url}/api/voices", timeout=self._timeouts)
             
             if response.status_code == 200:
-                voices_data = response.json()
-                voices = [voice.get('name', voice.get('id', '')) for voice in voices_data]
+                voices = self._cache_voices(orjson.loads(response.content))
                 self.logger.info(f"Found {len(voices)} available voices")
                 return voices
             else:
@@ -157,6 +335,30 @@ class AllTalkTTS(BaseTTS):
             self.logger.error(f"Error getting available voices: {e}")
             return []
     
+    def _cache_voices(self, voices_data: Any) -> List[str]:
+        """
+        Extract voice names from an ``/api/voices`` response and cache them.
+        
+        Accepts either a list or a ``{"voices": [...]}`` object, with each
+        entry a voice name or a dict carrying ``name``/``id``.
+        
+        Args:
+            voices_data: Parsed ``/api/voices`` response
+            
+        Returns:
+            List of voice names
+        """
+        if isinstance(voices_data, dict):
+            voices_data = voices_data.get('voices', [])
+        
+        self._voices_cache = [
+            voice if isinstance(voice, str) else voice.get('name', voice.get('id', ''))
+            for voice in voices_data
+        ]
+        self._voice_names = frozenset(self._voices_cache)
+        self._voices_cache_ts = time.monotonic()
+        return self._voices_cache
+    
     def set_voice(self, voice: str) -> bool:
         """
         Set the voice to use for speech.
@@ -168,10 +370,13 @@ class AllTalkTTS(BaseTTS):
             True if successful, False otherwise
         """
         try:
-            # Check if voice is available
-            available_voices = self.get_available_voices()
+            # Any voice AllTalk has listed this session is accepted without a
+            # request; only an unknown name triggers a refresh, since the
+            # cached list may predate a newly added voice
+            if voice not in self._voice_names:
+                self.get_available_voices(refresh=True)
             
-            if voice not in available_voices:
+            if voice not in self._voice_names:
                 self.logger.error(f"Voice {voice} not found in available voices")
                 return False
             
@@ -193,15 +398,11 @@ class AllTalkTTS(BaseTTS):
         Returns:
             True if installed, False otherwise
         """
-        try:
-            # Check if AllTalk is already running
-            response = requests.get(f"{self.base_url}/api/voices", timeout=3)
-            if response.status_code == 200:
-                self.alltalk_installed = True
-                self.logger.info("AllTalk TTS is already running")
-                return True
-        except:
-            pass
+        # Check if AllTalk is already running
+        if self.check_alltalk_running():
+            self.alltalk_installed = True
+            self.logger.info("AllTalk TTS is already running")
+            return True
         
         # Check if AllTalk is installed locally
         possible_paths = [
@@ -269,35 +470,25 @@ class AllTalkTTS(BaseTTS):
                 self.logger.info("AllTalk TTS server is already running")
                 return True
             
-            # Start server
-            start_cmd = [
-                "python", "start_alltalk.py"
-            ]
-            
-            # Change to AllTalk directory
-            original_dir = os.getcwd()
-            os.chdir(self.alltalk_path)
-            
-            # Start server in background
+            # Start server in background from the AllTalk directory; output is
+            # discarded since nothing reads it and a full pipe would stall it
             process = subprocess.Popen(
-                start_cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
+                [sys.executable, "start_alltalk.py"],
+                cwd=self.alltalk_path,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
             )
             
-            # Wait for server to start
-            time.sleep(5)
-            
-            # Check if server started successfully
-            if self.check_alltalk_running():
+            # Poll until the server answers, giving up early if it exits
+            if wait_until(self.check_alltalk_running, SERVER_START_TIMEOUT, process):
                 self.logger.info("AllTalk TTS server started successfully")
-                os.chdir(original_dir)
                 return True
+            
+            if process.poll() is not None:
+                self.logger.error(f"AllTalk TTS server exited during startup (code {process.returncode})")
             else:
                 self.logger.error("Failed to start AllTalk TTS server")
-                os.chdir(original_dir)
-                return False
+            return False
                 
         except Exception as e:
             self.logger.error(f"Error starting AllTalk TTS server: {e}")
@@ -307,14 +498,12 @@ class AllTalkTTS(BaseTTS):
         """
         Check if AllTalk TTS server is running.
         
+        Uses a single HEAD request so no response body is downloaded.
+        
         Returns:
             True if running, False otherwise
         """
-        try:
-            response = requests.get(f"{self.base_url}/api/voices", timeout=3)
-            return response.status_code == 200
-        except:
-            return False
+        return is_listening(self.session, f"{self.base_url}/", PROBE_TIMEOUTS)
     
     def generate_audio(self, text: str, test_mode: bool = False) -> Optional[str]:
         """
@@ -337,19 +526,40 @@ class AllTalkTTS(BaseTTS):
                 "volume": self.volume
             }
             
+            cache_file = self._audio_cache_path(payload)
+            if cache_file and self._touch_cached_audio(cache_file):
+                self.logger.debug(f"Audio cache hit: {cache_file}")
+                return cache_file
+            
             self.logger.debug(f"Generating audio for text: {text[:50]}...")
             
             # Make request to AllTalk TTS
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/tts",
-                json=payload,
-                timeout=self.timeout
+                data=orjson.dumps(payload),
+                headers={"Content-Type": "application/json"},
+                timeout=self._timeouts
             )
             
             if response.status_code == 200:
                 # Save audio file
                 audio_data = response.content
-                audio_file = f"temp_audio/speech_{int(time.time())}.wav"
+                
+                if cache_file:
+                    # Write under a unique name, then move into place, so a
+                    # concurrent reader never sees a partial file
+                    os.makedirs(self.audio_cache_dir, exist_ok=True)
+                    partial_file = f"{cache_file}.{threading.get_ident()}.part"
+                    with open(partial_file, "wb") as f:
+                        f.write(audio_data)
+                    os.replace(partial_file, cache_file)
+                    
+                    self.logger.debug(f"Audio generated and cached: {cache_file}")
+                    return cache_file
+                
+                # Nanosecond name: chunks generated ahead of playback must not
+                # overwrite a file that is still playing
+                audio_file = f"temp_audio/speech_{time.time_ns()}.wav"
                 
                 # Ensure temp_audio directory exists
                 os.makedirs("temp_audio", exist_ok=True)
@@ -367,6 +577,84 @@ class AllTalkTTS(BaseTTS):
             self.logger.error(f"Error generating audio: {e}")
             return None
     
+    def _audio_cache_path(self, payload: Dict[str, Any]) -> Optional[str]:
+        """
+        Get the cache file for a generation request.
+        
+        Args:
+            payload: Request payload sent to AllTalk
+            
+        Returns:
+            Path of the cached audio file, or None if caching is disabled
+        """
+        if not self.audio_cache_dir:
+            return None
+        
+        key = hashlib.blake2b(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+        return os.path.join(self.audio_cache_dir, f"{key}.wav")
+    
+    def _touch_cached_audio(self, cache_file: str) -> bool:
+        """
+        Refresh a cached file's mtime, used for LRU eviction.
+        
+        Doubles as the existence check, so a lookup costs one system call.
+        
+        Args:
+            cache_file: Path from ``_audio_cache_path``
+            
+        Returns:
+            True if the file is cached, False otherwise
+        """
+        try:
+            os.utime(cache_file)
+            return True
+        except FileNotFoundError:
+            return False
+    
+    def _is_cached_audio(self, audio_file: str) -> bool:
+        """
+        Check whether an audio file belongs to the audio cache.
+        
+        Args:
+            audio_file: Path to audio file
+            
+        Returns:
+            True if the file lives in the cache directory
+        """
+        if self._audio_cache_key is None:
+            return False
+        return os.path.normcase(os.path.dirname(os.path.abspath(audio_file))) == self._audio_cache_key
+    
+    def _evict_audio_cache(self) -> None:
+        """Delete least recently used cached audio until the cache fits its size cap."""
+        if not self.audio_cache_dir or not os.path.isdir(self.audio_cache_dir):
+            return
+        
+        entries = []
+        total = 0
+        with os.scandir(self.audio_cache_dir) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(".wav"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        
+        limit = self.audio_cache_mb * 1024 * 1024
+        if total <= limit:
+            return
+        
+        entries.sort()
+        for _, size, path in entries:
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+            if total <= limit:
+                break
+        
+        self.logger.debug(f"Audio cache trimmed to {total // 1024} KB")
+    
     def _clean_text_for_tts(self, text: str) -> str:
         """
         Clean text for TTS processing.
@@ -375,28 +663,26 @@ class AllTalkTTS(BaseTTS):
             text: Raw text
             
         Returns:
-            Cleaned text
+            Cleaned text, or an empty string if nothing speakable remains
         """
         # Remove markdown formatting
-        import re
-        
-        # Remove markdown links
-        text = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', text)
-        
-        # Remove markdown bold/italic
-        text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)
-        text = re.sub(r'\*([^*]+)\*', r'\1', text)
+        text = MD_LINK_RE.sub(r'\1', text)
+        text = MD_BOLD_RE.sub(r'\1', text)
+        text = MD_ITALIC_RE.sub(r'\1', text)
         
         # Remove code blocks
-        text = re.sub(r'```[^`]*```', '', text)
-        text = re.sub(r'`([^`]+)`', r'\1', text)
+        text = CODE_BLOCK_RE.sub('', text)
+        text = INLINE_CODE_RE.sub(r'\1', text)
         
         # Remove URLs
-        text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
+        text = URL_RE.sub('', text)
         
         # Clean up whitespace
-        text = re.sub(r'\s+', ' ', text)
-        text = text.strip()
+        text = WHITESPACE_RE.sub(' ', text).strip()
+        
+        # Don't send pure punctuation or symbols to AllTalk
+        if not SPEAKABLE_RE.search(text):
+            return ""
         
         return text
     
@@ -419,15 +705,15 @@ class AllTalkTTS(BaseTTS):
             pygame.mixer.music.load(audio_file)
             pygame.mixer.music.play()
             
-            # Wait for playback to complete
+            # Wait for playback to complete; get_busy() is cheap, so a short
+            # interval lets the next chunk start right after this one ends
             while pygame.mixer.music.get_busy():
-                time.sleep(0.1)
+                time.sleep(PLAYBACK_POLL_INTERVAL)
             
-            # Clean up audio file
-            try:
-                os.remove(audio_file)
-            except:
-                pass
+            # Release the file so it can be deleted (Windows keeps it locked)
+            pygame.mixer.music.unload()
+            
+            self._discard_audio_file(audio_file)
             
             return True
             
@@ -435,6 +721,38 @@ class AllTalkTTS(BaseTTS):
             self.logger.error(f"Error playing audio: {e}")
             return False
     
+    def _discard_audio_file(self, audio_file: str) -> None:
+        """
+        Delete a played temp audio file; cached audio is kept for reuse.
+        
+        When chunks are being queued, the delete runs on the generation
+        worker so the next chunk can start playing without waiting for it.
+        
+        Args:
+            audio_file: Path to audio file
+        """
+        if self._is_cached_audio(audio_file):
+            return
+        
+        executor = self._generate_executor
+        if executor is not None:
+            try:
+                executor.submit(self._remove_file, audio_file)
+                return
+            except RuntimeError:
+                # Executor already shut down; remove inline
+                pass
+        
+        self._remove_file(audio_file)
+    
+    @staticmethod
+    def _remove_file(path: str) -> None:
+        """Remove a file, ignoring errors."""
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    
     def stop_speaking(self) -> bool:
         """
         Stop current speech playback.
@@ -443,6 +761,15 @@ class AllTalkTTS(BaseTTS):
             True if successful, False otherwise
         """
         try:
+            # Drop queued chunks and any chunk that is still being generated
+            with self._queue_changed:
+                for pending_audio in self.speech_queue:
+                    pending_audio.cancel()
+                self.speech_queue.clear()
+                self._pending_chunks = 0
+                self._queue_epoch += 1
+                self._queue_changed.notify_all()
+            
             if self.pygame_available:
                 pygame.mixer.music.stop()
             
@@ -455,8 +782,17 @@ class AllTalkTTS(BaseTTS):
     
     def cleanup(self) -> None:
         """Clean up AllTalk TTS resources."""
+        # Let the playback worker exit
+        with self._queue_changed:
+            self._stopping = True
+            self._queue_changed.notify_all()
+        
         self.stop_speaking()
         
+        if self._generate_executor is not None:
+            self._generate_executor.shutdown(wait=False, cancel_futures=True)
+            self._generate_executor = None
+        
         # Clean up temp audio files
         try:
             import glob
@@ -468,4 +804,11 @@ class AllTalkTTS(BaseTTS):
         except:
             pass
         
+        try:
+            self._evict_audio_cache()
+        except OSError as e:
+            self.logger.warning(f"Failed to trim audio cache: {e}")
+        
+        self.session.close()
+        
         super().cleanup()
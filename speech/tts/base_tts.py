@@ -74,6 +74,34 @@ class BaseTTS(ABC):
         """
         pass
     
+    def speak_chunk(self, text: str) -> bool:
+        """
+        Speak part of a longer text as soon as it is available.
+        
+        Providers that can play audio in the background override this to
+        queue the text and return immediately; the default speaks it
+        synchronously.
+        
+        Args:
+            text: Text to speak, typically one or more complete sentences
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        return self.speak(text)
+    
+    def wait_until_done(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every chunk passed to ``speak_chunk`` has been spoken.
+        
+        Args:
+            timeout: Maximum number of seconds to wait, or None to wait indefinitely
+            
+        Returns:
+            True if all chunks were spoken successfully, False otherwise
+        """
+        return True
+    
     def stop_speaking(self) -> bool:
         """
         Stop current speech playback.
@@ -0,0 +1,65 @@
+"""
+Shared HTTP helpers for Carlos Assistant service clients.
+"""
+
+from typing import Any, Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# Connect timeout in seconds; kept short so an unreachable server fails fast
+CONNECT_TIMEOUT = 3.05
+
+
+def create_session(pool_maxsize: int, retries: int = 0, backoff_factor: float = 0,
+                   headers: Optional[Dict[str, str]] = None) -> requests.Session:
+    """
+    Create a keep-alive session for talking to a single local service.
+    
+    Only gateway errors (502/503/504) on idempotent requests are retried:
+    connection failures should surface immediately, and POSTs such as
+    generations are never replayed.
+    
+    Args:
+        pool_maxsize: Maximum number of pooled connections to the host
+        retries: Number of retries for gateway errors
+        backoff_factor: urllib3 backoff factor between retries
+        headers: Extra default headers for every request
+    
+    Returns:
+        Configured session
+    """
+    session = requests.Session()
+    retry = Retry(total=retries, connect=0, read=0, backoff_factor=backoff_factor,
+                  status_forcelist=[502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+# Statuses showing a HEAD probe reached a running server; FastAPI answers HEAD
+# on GET-only routes with 405, which still means it is up
+ALIVE_STATUSES = (200, 307, 404, 405)
+
+
+def is_listening(session: requests.Session, url: str, timeout: Any) -> bool:
+    """
+    Check whether a server answers at a URL, without downloading a body.
+    
+    Args:
+        session: Session to send the HEAD request with
+        url: URL to probe
+        timeout: Request timeout, a number or (connect, read) tuple
+        
+    Returns:
+        True if the server responded, False otherwise
+    """
+    try:
+        response = session.head(url, timeout=timeout, allow_redirects=False)
+        return response.status_code in ALIVE_STATUSES
+    except requests.exceptions.RequestException:
+        return False
@@ -117,40 +117,52 @@ class CarlosLogger:
         
         return safe_message
     
-    def debug(self, message: str) -> None:
-        """Log debug message."""
+    def is_enabled_for(self, level: int) -> bool:
+        """
+        Check whether a message at the given level would be logged.
+        
+        Args:
+            level: Logging level, e.g. ``logging.DEBUG``
+            
+        Returns:
+            True if the level is enabled, False otherwise
+        """
+        return self.logger.isEnabledFor(level)
+    
+    def debug(self, message: str, *args) -> None:
+        """Log debug message; ``args`` are %-formatted only if the record is emitted."""
         try:
-            self.logger.debug(message)
+            self.logger.debug(message, *args)
         except UnicodeEncodeError:
-            self.logger.debug(self._safe_log_message(message))
+            self.logger.debug(self._safe_log_message(message), *args)
     
-    def info(self, message: str) -> None:
-        """Log info message."""
+    def info(self, message: str, *args) -> None:
+        """Log info message; ``args`` are %-formatted only if the record is emitted."""
         try:
-            self.logger.info(message)
+            self.logger.info(message, *args)
         except UnicodeEncodeError:
-            self.logger.info(self._safe_log_message(message))
+            self.logger.info(self._safe_log_message(message), *args)
     
-    def warning(self, message: str) -> None:
-        """Log warning message."""
+    def warning(self, message: str, *args) -> None:
+        """Log warning message; ``args`` are %-formatted only if the record is emitted."""
         try:
-            self.logger.warning(message)
+            self.logger.warning(message, *args)
         except UnicodeEncodeError:
-            self.logger.warning(self._safe_log_message(message))
+            self.logger.warning(self._safe_log_message(message), *args)
     
-    def error(self, message: str, exc_info: bool = False) -> None:
-        """Log error message."""
+    def error(self, message: str, *args, exc_info: bool = False) -> None:
+        """Log error message; ``args`` are %-formatted only if the record is emitted."""
         try:
-            self.logger.error(message, exc_info=exc_info)
+            self.logger.error(message, *args, exc_info=exc_info)
         except UnicodeEncodeError:
-            self.logger.error(self._safe_log_message(message), exc_info=exc_info)
+            self.logger.error(self._safe_log_message(message), *args, exc_info=exc_info)
     
-    def critical(self, message: str, exc_info: bool = False) -> None:
-        """Log critical message."""
+    def critical(self, message: str, *args, exc_info: bool = False) -> None:
+        """Log critical message; ``args`` are %-formatted only if the record is emitted."""
         try:
-            self.logger.critical(message, exc_info=exc_info)
+            self.logger.critical(message, *args, exc_info=exc_info)
         except UnicodeEncodeError:
-            self.logger.critical(self._safe_log_message(message), exc_info=exc_info)
+            self.logger.critical(self._safe_log_message(message), *args, exc_info=exc_info)
 
 
 class UnicodeFilter(logging.Filter):
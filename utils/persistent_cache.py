@@ -0,0 +1,105 @@
+"""
+Persistent key/value cache for Carlos Assistant backed by SQLite.
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from typing import Optional
+from utils.logger import CarlosLogger
+
+
+class PersistentCache:
+    """Small SQLite store for cached AI replies that survives restarts."""
+    
+    def __init__(self, path: str, logger: CarlosLogger, max_entries: int = 10000):
+        """
+        Open (or create) the cache database.
+        
+        Args:
+            path: Database file path
+            logger: Logger instance
+            max_entries: Maximum number of rows kept; oldest are evicted
+        """
+        self.logger = logger
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            
+            # Shutdown cleanup may close the connection from a worker thread
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache "
+                "(key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS llm_cache_created ON llm_cache (created_at)")
+            self._db.commit()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Persistent cache unavailable ({path}): {e}")
+            self._db = None
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached value.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Cached value or None if missing or the cache is unavailable
+        """
+        if self._db is None:
+            return None
+        
+        try:
+            with self._lock:
+                row = self._db.execute("SELECT response FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            return row[0] if row else None
+        except sqlite3.Error as e:
+            self.logger.warning(f"Persistent cache read failed: {e}")
+            return None
+    
+    def set(self, key: str, value: str) -> None:
+        """
+        Store a value, evicting the oldest rows beyond ``max_entries``.
+        
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        if self._db is None:
+            return
+        
+        try:
+            with self._lock, self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, response, created_at) VALUES (?, ?, ?)",
+                    (key, value, time.time())
+                )
+                self._db.execute(
+                    "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache "
+                    "ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+        except sqlite3.Error as e:
+            self.logger.warning(f"Persistent cache write failed: {e}")
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        if self._db is None:
+            return
+        
+        with self._lock:
+            try:
+                self._db.close()
+            except sqlite3.Error:
+                pass
+            self._db = None
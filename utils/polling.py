@@ -0,0 +1,43 @@
+"""
+Readiness polling helper for services Carlos starts.
+"""
+
+import time
+import subprocess
+from typing import Callable, Optional
+
+
+# Delays between readiness checks; the last value repeats until the timeout
+WAIT_DELAYS = (0.01, 0.05, 0.1, 0.2, 0.4, 0.5)
+
+
+def wait_until(check: Callable[[], bool], timeout: float = 10.0,
+               process: Optional[subprocess.Popen] = None) -> bool:
+    """
+    Poll a readiness check with increasing delays.
+    
+    Args:
+        check: Callable returning True once the service is ready
+        timeout: Maximum number of seconds to wait
+        process: Process serving the check; stop waiting as soon as it exits
+    
+    Returns:
+        True if the check succeeded before the timeout, False otherwise
+    """
+    deadline = time.monotonic() + timeout
+    attempt = 0
+    
+    while True:
+        if check():
+            return True
+        
+        if process is not None and process.poll() is not None:
+            return False
+        
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        
+        delay = WAIT_DELAYS[min(attempt, len(WAIT_DELAYS) - 1)]
+        time.sleep(min(delay, remaining))
+        attempt += 1